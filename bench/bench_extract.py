@@ -0,0 +1,95 @@
+import sys
+import json
+import time
+import argparse
+
+from bench.synthetic import make_match_script
+from core.extract import extract_match_centre
+
+
+# =========================
+# Benchmark: původní cesty ze scriptu k datům vs. core.extract.extract_match_centre
+#   LM:  hledání konce JSONu po znacích + rozdělení a json.loads po fragmentech (pages/LM.py)
+#   30s: rozdělení a json.loads po fragmentech nad celým scriptem (30s.py)
+# Každá původní cesta má vlastní poměr proti stejnému měření extract.
+#   python -m bench.bench_extract --events 800 1700 3500
+# =========================
+
+def legacy_brace_scan(target_script_content: str) -> str:
+    # Kopie původní smyčky – závorky v řetězcích nerozlišuje
+    script = target_script_content.strip().replace('\n', '').replace('\t', '')
+    start_idx = len(script)
+    for pattern in ["matchId", "matchCenter", "{"]:
+        idx = script.find(pattern)
+        if idx != -1 and idx < start_idx:
+            start_idx = idx
+
+    brace_count = 0
+    in_json = False
+    end_idx = len(script) - 1
+    for i in range(start_idx, len(script)):
+        if script[i] == '{':
+            brace_count += 1
+            in_json = True
+        elif script[i] == '}':
+            brace_count -= 1
+            if in_json and brace_count == 0:
+                end_idx = i
+                break
+    return script[start_idx:end_idx + 1]
+
+
+def legacy_split_parse(script: str) -> dict:
+    # Původní rozdělení podle ',            ' a json.loads po fragmentech (30s.py)
+    script = script.strip().replace('\n', '').replace('\t', '')
+    script = script[script.index("matchId"):script.rindex("}")]
+    parts = list(filter(None, script.split(',            ')))
+    metadata = json.loads(parts[1][parts[1].index('{'):])
+    for p in parts:
+        k, v = p.split(':', 1)
+        if k.strip() not in metadata:
+            try:
+                metadata[k.strip()] = json.loads(v.strip())
+            except Exception:
+                pass
+    return metadata
+
+
+def legacy_lm_path(script: str) -> dict:
+    # Celá původní cesta v pages/LM.py: fragment z brace loop → stejné parsování po fragmentech
+    return legacy_split_parse(legacy_brace_scan(script))
+
+
+def best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark extrakce dat zápasu ze scriptu")
+    parser.add_argument("--events", type=int, nargs="+", default=[800, 1700, 3500])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    print(f"{'události':>9} {'MB':>6} {'LM cesta':>10} {'30s cesta':>10} {'extract':>9} "
+          f"{'zrychl. LM':>11} {'zrychl. 30s':>12}")
+    for n in args.events:
+        script = make_match_script(n_events=n)
+        mb = len(script.encode("utf-8")) / 1e6
+        t_lm = best_of(legacy_lm_path, script, args.repeat)
+        t_split = best_of(legacy_split_parse, script, args.repeat)
+        t_new = best_of(extract_match_centre, script, args.repeat)
+        # Obě původní cesty vedou od textu scriptu k datům → každá zvlášť proti jednomu extract
+        speedup_lm = t_lm / t_new if t_new else float("inf")
+        speedup_30s = t_split / t_new if t_new else float("inf")
+        print(f"{n:>9} {mb:>6.2f} {t_lm * 1000:>8.1f}ms {t_split * 1000:>8.1f}ms "
+              f"{t_new * 1000:>7.1f}ms {speedup_lm:>10.1f}x {speedup_30s:>11.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
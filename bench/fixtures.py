@@ -0,0 +1,145 @@
+import os
+import re
+import sys
+import gzip
+import json
+import argparse
+import datetime
+
+from bench.synthetic import make_match_page, make_scheduled_events
+
+
+# =========================
+# Fixtury pro bench/suite.py (bez sítě): uložené stránky zápasu a scheduled-events
+#   bench/fixtures/match-<velikost>.html.gz   stránka zápasu WhoScored
+#   bench/fixtures/sched-<velikost>.json.gz   {"YYYY-MM-DD": odpověď scheduled-events, …} za týden
+# Výchozí sada je syntetická (bench/synthetic.py, deterministická) a je v gitu,
+# aby se výsledky daly porovnávat s bench/baseline.json. Skutečnou stránku
+# lze přidat jako další velikost:
+#
+#   python -m bench.fixtures                    # (pře)generovat výchozí sadu
+#   python -m bench.fixtures --record real https://www.whoscored.com/matches/1874065/live/x
+#   python -m bench.fixtures --serve-dir .cache/fixture-site   # rozložení pro tools/fixture_server.py
+# =========================
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+MATCH_SIZES = {"small": 400, "medium": 1700, "large": 3500}
+SCHED_SIZES = {"small": 100, "medium": 400, "large": 1500}
+SCHED_DAYS = 7
+SCHED_START = datetime.date(2025, 9, 1)
+SCHED_TEAM_IDS = (2216, 349)
+
+_MATCH_ID_RE = re.compile(r"matchId\s*:\s*(\d+)")
+
+
+def match_path(size: str) -> str:
+    return os.path.join(FIXTURES_DIR, f"match-{size}.html.gz")
+
+
+def sched_path(size: str) -> str:
+    return os.path.join(FIXTURES_DIR, f"sched-{size}.json.gz")
+
+
+def _write_gz(path: str, text: str):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # mtime=0 → stejný obsah dá stejný soubor (žádné zbytečné změny v gitu)
+    with open(path, "wb") as f:
+        f.write(gzip.compress(text.encode("utf-8"), compresslevel=9, mtime=0))
+
+
+def generate(sizes=None):
+    for size, n_events in MATCH_SIZES.items():
+        if sizes is None or size in sizes:
+            _write_gz(match_path(size), make_match_page(n_events=n_events))
+    for size, n_events in SCHED_SIZES.items():
+        if sizes is None or size in sizes:
+            days = [SCHED_START + datetime.timedelta(days=i) for i in range(SCHED_DAYS)]
+            payload = {d.isoformat(): make_scheduled_events(d, n_events=n_events, team_ids=SCHED_TEAM_IDS, every=2)
+                       for d in days}
+            _write_gz(sched_path(size), json.dumps(payload))
+
+
+def match_sizes() -> list:
+    # Všechny uložené stránky (výchozí velikosti i nahrané přes --record)
+    if not os.path.isdir(FIXTURES_DIR):
+        return []
+    names = sorted(f[len("match-"):-len(".html.gz")] for f in os.listdir(FIXTURES_DIR)
+                   if f.startswith("match-") and f.endswith(".html.gz"))
+    order = list(MATCH_SIZES)
+    return sorted(names, key=lambda s: (order.index(s) if s in order else len(order), s))
+
+
+def load_match_page(size: str) -> str:
+    with gzip.open(match_path(size), "rt", encoding="utf-8") as f:
+        return f.read()
+
+
+def load_sched(size: str) -> dict:
+    # Syrové bajty odpovědí po dnech – parsování JSON je součást měření
+    with gzip.open(sched_path(size), "rt", encoding="utf-8") as f:
+        payload = json.load(f)
+    return {day: json.dumps(body).encode("utf-8") for day, body in payload.items()}
+
+
+def write_serve_layout(root: str, size: str = "medium") -> list:
+    # Fixtury dané velikosti v rozložení tools/fixture_server.py:
+    #   <root>/matches/<matchId>.html, <root>/api/v1/sport/football/scheduled-events/<den>.json
+    # Vrací cesty stránek zápasů (/matches/<matchId>/live/fixture)
+    page_html = load_match_page(size)
+    m = _MATCH_ID_RE.search(page_html)
+    if m is None:
+        raise ValueError(f"match-{size}.html.gz neobsahuje matchId")
+    os.makedirs(os.path.join(root, "matches"), exist_ok=True)
+    with open(os.path.join(root, "matches", f"{m.group(1)}.html"), "w", encoding="utf-8") as f:
+        f.write(page_html)
+
+    if os.path.exists(sched_path(size)):
+        folder = os.path.join(root, "api", "v1", "sport", "football", "scheduled-events")
+        os.makedirs(folder, exist_ok=True)
+        for day, body in load_sched(size).items():
+            with open(os.path.join(folder, f"{day}.json"), "wb") as f:
+                f.write(body)
+    return [f"/matches/{m.group(1)}/live/fixture"]
+
+
+def ensure(sizes=None):
+    missing = [s for s in (sizes or MATCH_SIZES)
+               if s in MATCH_SIZES and not (os.path.exists(match_path(s)) and os.path.exists(sched_path(s)))]
+    if missing:
+        generate(missing)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fixtury pro offline benchmarky")
+    parser.add_argument("--record", nargs=2, metavar=("NAME", "URL"),
+                        help="uložit skutečnou stránku zápasu jako match-NAME.html.gz (jediný krok se sítí)")
+    parser.add_argument("--serve-dir", default=None, help="zapsat fixtury do rozložení tools/fixture_server.py")
+    parser.add_argument("--size", default="medium", help="velikost pro --serve-dir (small/medium/large/nahraná)")
+    args = parser.parse_args(argv)
+
+    if args.serve_dir:
+        ensure([args.size])
+        paths = write_serve_layout(args.serve_dir, args.size)
+        print(f"💾 {args.size} → {args.serve_dir}: {', '.join(paths)} + scheduled-events {SCHED_DAYS} dní od {SCHED_START}")
+        return 0
+
+    if args.record:
+        from core.http_fetch import fetch_match_html
+        name, url = args.record
+        page_html = fetch_match_html(url)
+        if page_html is None:
+            return 1
+        _write_gz(match_path(name), page_html)
+        print(f"💾 {url} → {match_path(name)} ({len(page_html) / 1e6:.2f} MB)")
+        return 0
+
+    generate()
+    for size in MATCH_SIZES:
+        print(f"💾 {size}: {os.path.getsize(match_path(size)) / 1e3:.0f} kB stránka, "
+              f"{os.path.getsize(sched_path(size)) / 1e3:.0f} kB scheduled-events")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
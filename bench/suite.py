@@ -0,0 +1,286 @@
+import io
+import os
+import sys
+import json
+import time
+import shutil
+import socket
+import argparse
+import platform
+import tempfile
+import statistics
+import contextlib
+import tracemalloc
+
+from bench import fixtures
+from core import loader_30s, loader_lm
+from core.extract import extract_match_args, extract_match_centre, match_centre_from_args
+from core.http_fetch import find_match_script, parse_breadcrumb
+from core.loader import build_events_df
+from core.match_index import MatchIndex
+from core.pitch_assets import template_leftovers
+from core.qualifiers import build_qualifier_table, project_qualifiers
+from core.render import PLOT_COLUMNS, RenderJob, render_job
+from core.schema import build_match_table
+from core.teams import TRACKED_TEAM_IDS
+from scraper import matches_from_events
+
+
+# =========================
+# Offline benchmark celé cesty dat (bez sítě, bez prohlížeče), fixtury z bench/fixtures.py
+#   loader   – fáze načtení zápasu (core/loader.py, sloupce 30s i LM): hledání scriptu,
+#              parsování JSON (text scriptu i JSON z execute_script), zploštění událostí,
+#              qualifiers (dlouhý i široký tvar)
+#   plots    – oba grafy z core/plots.py (Agg → PNG, jako render worker); po běhu kontrola,
+#              že na sdílených šablonách os nezůstaly vrstvy ani kontejnery z předchozích grafů
+#   scraper  – scheduled-events: JSON, výběr zápasů, upsert do SQLite, opakovaný upsert, export CSV
+# Pro každou fázi: nejlepší a medián z --repeat běhů, propustnost a špička paměti
+# (tracemalloc, samostatný běh – trasování zpomaluje, do časů se nepočítá).
+#
+#   python -m bench.suite                         # porovnání s bench/baseline.json
+#   python -m bench.suite --only loader --sizes medium
+#   python -m bench.suite --save-baseline         # nová baseline (po vědomé změně výkonu)
+#   python -m bench.suite --check                 # exit 1 při zpomalení nad --tolerance
+# Baseline je z jednoho stroje – na jiném porovnávej jen relativně (nebo si ulož vlastní).
+# =========================
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+GROUPS = ["loader", "plots", "scraper"]
+LOADERS = {"30s": loader_30s, "lm": loader_lm}
+PLOT_KINDS = ["final_third_entries", "box_entries_heatmap"]
+
+# Rozdíl pod touto hranicí je šum i při velkém poměru (fáze v řádu desetin ms)
+MIN_REGRESSION_MS = 2.0
+
+
+@contextlib.contextmanager
+def _quiet():
+    # LM loader tiskne průběh – do měření nepatří
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def _offline():
+    # Pojistka, že měření opravdu nesahá na síť (výsledky by pak nebyly srovnatelné)
+    original = socket.socket.connect
+
+    def refuse(self, address):
+        raise RuntimeError(f"benchmark nesmí používat síť ({address})")
+
+    socket.socket.connect = refuse
+    try:
+        yield
+    finally:
+        socket.socket.connect = original
+
+
+def measure(fn, repeat: int) -> dict:
+    times = []
+    with _quiet():
+        fn()  # zahřátí (importy, první alokace)
+        for _ in range(repeat):
+            t0 = time.perf_counter()
+            fn()
+            times.append(time.perf_counter() - t0)
+        tracemalloc.start()
+        try:
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+    return {"best_ms": min(times) * 1000, "median_ms": statistics.median(times) * 1000, "peak_mb": peak / 1e6}
+
+
+def _stage(results: dict, name: str, fn, repeat: int, units: float, unit: str):
+    r = measure(fn, repeat)
+    r["throughput"] = units / (r["best_ms"] / 1000) if r["best_ms"] else float("inf")
+    r["unit"] = unit
+    results[name] = r
+    return r
+
+
+def bench_loader(size: str, repeat: int, results: dict):
+    page_html = fixtures.load_match_page(size)
+    mb = len(page_html.encode("utf-8")) / 1e6
+    script = find_match_script(page_html)
+    data = extract_match_centre(script)
+    n_events = len(data.get("events", []))
+    qualifier_lists = [e.get("qualifiers") for e in data.get("events", [])]
+
+    _stage(results, f"loader/{size}/extract", lambda: (find_match_script(page_html), parse_breadcrumb(page_html)),
+           repeat, mb, "MB/s")
+    _stage(results, f"loader/{size}/json_parse", lambda: extract_match_centre(script), repeat,
+           len(script.encode("utf-8")) / 1e6, "MB/s")
+    # Prohlížeč vrací JSON.stringify(require.config.params["args"]) → jeden json.loads (core.extract.match_centre_via_js)
+    args_json = json.dumps(extract_match_args(script), ensure_ascii=False)
+    _stage(results, f"loader/{size}/json_parse_js", lambda: match_centre_from_args(json.loads(args_json)), repeat,
+           len(args_json.encode("utf-8")) / 1e6, "MB/s")
+    _stage(results, f"loader/{size}/qualifiers", lambda: build_qualifier_table(qualifier_lists), repeat,
+           n_events, "ev/s")
+    quals = build_qualifier_table(qualifier_lists)
+    for name, module in LOADERS.items():
+        # build_events_df jen doplňuje matchId do událostí → opakované volání nad stejnými daty je v pořádku
+        _stage(results, f"loader/{size}/flatten_{name}",
+               lambda m=module: (build_events_df(data, m.ACTION_COL), build_match_table(data)), repeat, n_events, "ev/s")
+    with _quiet():
+        events_df = build_events_df(data, loader_lm.ACTION_COL)
+    _stage(results, f"loader/{size}/qualifiers_wide", lambda: project_qualifiers(events_df, quals), repeat,
+           n_events, "ev/s")
+    return n_events
+
+
+def bench_plots(size: str, repeat: int, results: dict):
+    data = extract_match_centre(find_match_script(fixtures.load_match_page(size)))
+    events_df = build_events_df(data, loader_30s.ACTION_COL)
+    style, action_col = loader_30s.PLOT_STYLE, loader_30s.ACTION_COL
+    home_tid = data.get("home", {}).get("teamId")
+    df_team = events_df[events_df["teamId"] == home_tid]
+    df_team = df_team[[c for c in PLOT_COLUMNS + [action_col] if c in df_team]]
+    for kind in PLOT_KINDS:
+        job = RenderJob(kind, df_team, style, action_col)
+        _stage(results, f"plots/{size}/{kind}", lambda j=job: render_job(j), repeat, 1, "fig/s")
+
+
+def bench_scraper(size: str, repeat: int, results: dict):
+    bodies = fixtures.load_sched(size)
+    team_ids = TRACKED_TEAM_IDS | frozenset(fixtures.SCHED_TEAM_IDS)
+    n_events = sum(body.count(b'"startTimestamp"') for body in bodies.values())
+    mb = sum(map(len, bodies.values())) / 1e6
+
+    payloads = {}
+    def parse():
+        for day, body in bodies.items():
+            payloads[day] = json.loads(body)
+    _stage(results, f"scraper/{size}/json_parse", parse, repeat, mb, "MB/s")
+
+    def select():
+        return [row for payload in payloads.values() for row in matches_from_events(payload["events"], team_ids)]
+    _stage(results, f"scraper/{size}/select", select, repeat, n_events, "ev/s")
+
+    # Zápis: sledované jsou všechny týmy z fixtury → velikost zápisu roste s fixturou
+    # (se skutečnými týmy je to pár řádků týdně a měření by bylo jen režie SQLite)
+    all_teams = frozenset(team["id"] for payload in payloads.values() for e in payload["events"]
+                          for team in (e["homeTeam"], e["awayTeam"]))
+    rows = [row for payload in payloads.values() for row in matches_from_events(payload["events"], all_teams)]
+    team_ids = all_teams
+
+    folder = tempfile.mkdtemp(prefix="bench-index-")
+    try:
+        db_path = os.path.join(folder, "index.sqlite")
+
+        def fresh_upsert():
+            if os.path.exists(db_path):
+                os.remove(db_path)
+            with MatchIndex(db_path) as index:
+                index.upsert(rows, team_ids)
+        _stage(results, f"scraper/{size}/upsert", fresh_upsert, repeat, len(rows), "rows/s")
+
+        def noop_upsert():
+            # Denní běh nad stejnými dny: nic se nepřepisuje
+            with MatchIndex(db_path) as index:
+                index.upsert(rows, team_ids)
+        _stage(results, f"scraper/{size}/upsert_rerun", noop_upsert, repeat, len(rows), "rows/s")
+
+        def export():
+            with MatchIndex(db_path) as index:
+                index.export_csv(os.path.join(folder, "all_matches.csv"))
+        _stage(results, f"scraper/{size}/export_csv", export, repeat, len(rows), "rows/s")
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+
+def environment() -> dict:
+    return {"python": platform.python_version(), "machine": platform.machine(), "system": platform.system(),
+            "cpus": os.cpu_count()}
+
+
+def load_baseline(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+    # Vrací zpomalené fáze: (název, baseline ms, nyní ms)
+    regressions = []
+    for name, r in results.items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        if r["best_ms"] > base["best_ms"] * (1 + tolerance) and r["best_ms"] - base["best_ms"] > MIN_REGRESSION_MS:
+            regressions.append((name, base["best_ms"], r["best_ms"]))
+    return regressions
+
+
+def print_results(results: dict, baseline: dict):
+    base_results = baseline.get("results", {})
+    print(f"{'fáze':<40} {'best':>9} {'medián':>9} {'propustnost':>16} {'paměť':>9} {'vs baseline':>12}")
+    for name, r in results.items():
+        base = base_results.get(name)
+        delta = f"{r['best_ms'] / base['best_ms']:>11.2f}x" if base and base["best_ms"] else f"{'–':>12}"
+        print(f"{name:<40} {r['best_ms']:>7.1f}ms {r['median_ms']:>7.1f}ms "
+              f"{r['throughput']:>11,.0f} {r['unit']:<4} {r['peak_mb']:>6.1f} MB {delta}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Offline benchmark načítání, grafů a scraperu")
+    parser.add_argument("--only", choices=GROUPS, action="append", default=None, help="jen vybraná skupina (opakovat)")
+    parser.add_argument("--sizes", nargs="+", default=None, help="velikosti fixtur (výchozí všechny uložené)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--save-baseline", action="store_true", help="uložit výsledky jako novou baseline")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="povolené zpomalení proti baseline (0.5 = 50 %%, sdílené stroje kolísají)")
+    parser.add_argument("--check", action="store_true", help="exit 1 při zpomalení nad toleranci")
+    parser.add_argument("--json", default=None, help="uložit výsledky do JSON souboru")
+    args = parser.parse_args(argv)
+
+    fixtures.ensure()
+    groups = args.only or GROUPS
+    sizes = args.sizes or fixtures.match_sizes()
+    results = {}
+    with _offline():
+        for size in sizes:
+            if "loader" in groups:
+                bench_loader(size, args.repeat, results)
+            if "plots" in groups:
+                bench_plots(size, args.repeat, results)
+            # Scheduled-events jen ve výchozích velikostech (--record ukládá jen stránky zápasů)
+            if "scraper" in groups and os.path.exists(fixtures.sched_path(size)):
+                bench_scraper(size, args.repeat, results)
+
+    baseline = load_baseline(args.baseline)
+    if baseline and baseline.get("environment") != environment():
+        print(f"⚠️ Baseline je z jiného prostředí ({baseline.get('environment')}) – porovnání jen orientační")
+    print_results(results, baseline)
+
+    run = {"environment": environment(), "repeat": args.repeat, "results": results}
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(run, f, indent=2)
+    if args.save_baseline:
+        # Sloučení: částečný běh (--only/--sizes) přepíše jen své fáze
+        merged = dict(baseline.get("results", {}), **results)
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(dict(run, results=dict(sorted(merged.items()))), f, indent=2)
+        print(f"💾 Baseline uložena: {args.baseline} ({len(merged)} fází)")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    for name, base_ms, now_ms in regressions:
+        print(f"🐢 {name}: {base_ms:.1f} ms → {now_ms:.1f} ms")
+    leftovers = template_leftovers() if "plots" in groups else {}
+    for key, count in leftovers.items():
+        # Zbytky na šabloně = únik paměti a zpomalování s každým dalším grafem
+        print(f"🧹 Šablona {key[0]}: po vykreslení zůstalo {count} vrstev/kontejnerů")
+    if not baseline:
+        print(f"ℹ️ Bez baseline ({args.baseline}) – ulož ji přes --save-baseline")
+    elif not regressions:
+        print(f"✅ Bez zpomalení nad {args.tolerance:.0%} proti baseline")
+    return 1 if (regressions or leftovers) and args.check else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
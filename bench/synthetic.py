@@ -0,0 +1,140 @@
+import os
+import json
+import random
+import datetime
+
+
+# =========================
+# Syntetické stránky zápasu ve tvaru WhoScored (pro benchmarky bez sítě)
+# Velikost odpovídá reálným stránkám: ~1 700 událostí ≈ 2–3 MB scriptu.
+# =========================
+
+_TYPES = ["Pass", "Pass", "Pass", "Pass", "BallRecovery", "Dribble", "TakeOn", "Tackle",
+          "Interception", "Clearance", "Aerial", "Foul", "SavedShot", "MissedShots", "Goal"]
+_PERIODS = ["FirstHalf", "SecondHalf"]
+_QUALIFIERS = ["Length", "Angle", "Zone", "PassEndX", "PassEndY", "Cross", "LongBall", "HeadPass",
+               "Throughball", "KeyPass", "BigChance", "FromCorner", "Chipped", "IntentionalAssist",
+               "StandingSave", "ThrowIn", "Freekick", "CornerTaken", "OppositeRelatedEvent", "Foul"]
+
+
+def make_match_centre(n_events: int = 1700, seed: int = 7, home_tid: int = 349, away_tid: int = 2216) -> dict:
+    rnd = random.Random(seed)
+    players = {str(100000 + i): f"Hráč {{{i}}} \"{chr(65 + i % 26)}\"" for i in range(36)}
+    player_ids = [int(p) for p in players]
+    events = []
+    minute = 0
+    for i in range(n_events):
+        minute = min(95, minute + (1 if rnd.random() < 0.06 else 0))
+        action = rnd.choice(_TYPES)
+        x, y = round(rnd.uniform(0, 100), 1), round(rnd.uniform(0, 100), 1)
+        event = {
+            "id": 2700000000 + i,
+            "eventId": i + 1,
+            "minute": minute,
+            "second": rnd.randint(0, 59),
+            "teamId": home_tid if rnd.random() < 0.52 else away_tid,
+            "playerId": rnd.choice(player_ids),
+            "x": x,
+            "y": y,
+            "expandedMinute": minute,
+            "period": {"value": 1 if minute < 46 else 2, "displayName": _PERIODS[minute >= 46]},
+            "type": {"value": _TYPES.index(action) + 1, "displayName": action},
+            "outcomeType": {"value": 1, "displayName": "Successful" if rnd.random() < 0.78 else "Unsuccessful"},
+            "qualifiers": [
+                {"type": {"value": j, "displayName": q}, "value": str(round(rnd.uniform(0, 100), 1))}
+                if rnd.random() < 0.6 else {"type": {"value": j, "displayName": q}}
+                for j, q in enumerate(rnd.sample(_QUALIFIERS, rnd.randint(1, 7)))
+            ],
+            "satisfiedEventsTypes": rnd.sample(range(200), rnd.randint(2, 9)),
+            "isTouch": rnd.random() < 0.8,
+        }
+        if action in ("Pass", "Dribble", "TakeOn"):
+            event["endX"] = round(min(100.0, max(0.0, x + rnd.uniform(-25, 35))), 1)
+            event["endY"] = round(min(100.0, max(0.0, y + rnd.uniform(-30, 30))), 1)
+        else:
+            event["endX"] = None
+            event["endY"] = None
+        if rnd.random() < 0.003:
+            event["cardType"] = {"value": 31, "displayName": "Yellow"}
+        events.append(event)
+
+    return {
+        "playerIdNameDictionary": players,
+        "periodMinuteLimits": {"1": 45, "2": 90},
+        "timeStoppageAmount": [2, 4],
+        "attendance": 10500,
+        "venueName": "Stadion {Eden} \\ Praha",
+        "referee": {"officialId": 1, "name": "Rozhodčí"},
+        "weatherCode": "",
+        "elapsed": "FT",
+        "startTime": "2025-09-05T20:45:00",
+        "startDate": "2025-09-05T00:00:00",
+        "score": "0 : 2",
+        "htScore": "0 : 1",
+        "ftScore": "0 : 2",
+        "etScore": "",
+        "pkScore": "",
+        "statusCode": 6,
+        "periodCode": 7,
+        "maxMinute": 95,
+        "home": {"teamId": home_tid, "name": "Domácí", "players": [], "stats": {}},
+        "away": {"teamId": away_tid, "name": "Hosté", "players": [], "stats": {}},
+        "events": events,
+    }
+
+
+def make_match_script(n_events: int = 1700, seed: int = 7, match_id: int = 1874065) -> str:
+    centre = json.dumps(make_match_centre(n_events, seed), ensure_ascii=False)
+    return (
+        "\n        require.config.params[\"args\"] = {\n"
+        f"            matchId: {match_id},\n"
+        f"            matchCentreData: {centre},\n"
+        "            matchCentreEventTypeJson: {\"pass\":1,\"shotOnTarget\":10,\"goal\":16},\n"
+        "            formationIdNameMappings: {\"2\":\"442\",\"8\":\"4231\"}\n"
+        "        };\n    "
+    )
+
+
+def make_match_page(n_events: int = 1700, seed: int = 7, match_id: int = 1874065) -> str:
+    filler = "".join(f'<script src="/static/bundle-{i}.js"></script>' for i in range(25))
+    return (
+        "<!DOCTYPE html><html><head><title>Domácí - Hosté</title>" + filler + "</head><body>"
+        '<div id="breadcrumb-nav"><span>International</span> '
+        '<a href="/regions/247/tournaments/124">World Cup Qualification UEFA - 2025/2026</a></div>'
+        '<div id="layout-wrapper"><script type="text/javascript">' + make_match_script(n_events, seed, match_id)
+        + "</script></div></body></html>"
+    )
+
+
+# =========================
+# Sofascore scheduled-events (pro scraper.py --base-url s tools/fixture_server.py)
+# =========================
+def make_scheduled_events(day, n_events: int = 400, seed: int = 7, team_ids=(2216,), every: int = 4) -> dict:
+    # Sledované týmy hrají jen každý `every`-tý den (počítáno od 1. 1.)
+    rng = random.Random(f"{seed}-{day.isoformat()}")
+    start = int(datetime.datetime(day.year, day.month, day.day, 12, tzinfo=datetime.timezone.utc).timestamp())
+    plays = day.toordinal() % every == 0
+    events = []
+    for i in range(n_events):
+        home_id, away_id = rng.randrange(1, 2000), rng.randrange(1, 2000)
+        if plays and i < len(team_ids):
+            home_id = team_ids[i]
+        events.append({
+            "id": day.toordinal() * 1000 + i,
+            "startTimestamp": start + rng.randrange(0, 8 * 3600),
+            "homeTeam": {"id": home_id, "name": f"Team {home_id}"},
+            "awayTeam": {"id": away_id, "name": f"Team {away_id}"},
+            "tournament": {"name": f"League {rng.randrange(1, 60)}"},
+            "status": {"type": "finished"},
+        })
+    return {"events": events}
+
+
+def write_scheduled_events(root: str, days, **kwargs) -> int:
+    # <root>/api/v1/sport/football/scheduled-events/<YYYY-MM-DD>.json
+    folder = os.path.join(root, "api", "v1", "sport", "football", "scheduled-events")
+    os.makedirs(folder, exist_ok=True)
+    for day in days:
+        with open(os.path.join(folder, f"{day.isoformat()}.json"), "w", encoding="utf-8") as f:
+            json.dump(make_scheduled_events(day, **kwargs), f)
+    return len(days)
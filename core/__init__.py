@@ -0,0 +1 @@
+# Sdílené moduly pro stránky Streamlit appky a pro scraper.
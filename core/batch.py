@@ -0,0 +1,78 @@
+import os
+import re
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from core.schema import concat_events
+
+# =========================
+# Dávkové načítání více zápasů s omezeným počtem souběžných workerů
+# Výsledky se vrací průběžně (generátor), jak které načtení doběhne.
+# Souběh prohlížečů navíc omezuje velikost DriverPoolu.
+# Chyby z no_retry (např. core.loader.BrowserUnavailable) se neopakují – výsledek hned s chybou.
+# =========================
+
+BATCH_WORKERS = int(os.environ.get("WS_BATCH_WORKERS", "4"))
+BATCH_RETRIES = int(os.environ.get("WS_BATCH_RETRIES", "2"))
+WHOSCORED_BASE_URL = os.environ.get("WS_BASE_URL", "https://1xbet.whoscored.com").rstrip("/")
+
+_REF_SPLIT_RE = re.compile(r"[\s,;]+")
+
+BatchResult = namedtuple("BatchResult", ["url", "ok", "value", "error", "attempts", "seconds"])
+
+
+def match_url_from_ref(ref) -> str:
+    # Holé WhoScored matchId → URL stránky zápasu (slug WhoScored doplní přesměrováním)
+    ref = str(ref).strip()
+    if ref.isdigit():
+        return f"{WHOSCORED_BASE_URL}/matches/{ref}/live"
+    return ref
+
+
+def parse_match_refs(text: str) -> list:
+    urls = []
+    for ref in _REF_SPLIT_RE.split(text or ""):
+        if ref:
+            url = match_url_from_ref(ref)
+            if url not in urls:
+                urls.append(url)
+    return urls
+
+
+def _load_with_retries(loader, url: str, retries: int, backoff: float, no_retry: tuple = ()) -> BatchResult:
+    started = time.monotonic()
+    attempts = 0
+    while True:
+        attempts += 1
+        try:
+            value = loader(url)
+            return BatchResult(url, True, value, None, attempts, time.monotonic() - started)
+        except Exception as e:
+            if attempts > retries or isinstance(e, no_retry):
+                return BatchResult(url, False, None, e, attempts, time.monotonic() - started)
+            time.sleep(backoff * 2 ** (attempts - 1))
+
+
+def load_matches(refs, loader, workers: int = BATCH_WORKERS, retries: int = BATCH_RETRIES, backoff: float = 2.0,
+                 no_retry: tuple = ()):
+    urls = [match_url_from_ref(r) for r in refs]
+    if not urls:
+        return
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(urls)))) as executor:
+        futures = [executor.submit(_load_with_retries, loader, url, retries, backoff, no_retry) for url in urls]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def combine_frames(frames) -> pd.DataFrame:
+    return concat_events(frames)
+
+
+def combine_matches(match_frames) -> pd.DataFrame:
+    tables = [m for m in match_frames if m is not None and not m.empty]
+    if not tables:
+        return pd.DataFrame()
+    return pd.concat(tables, ignore_index=True, sort=False)
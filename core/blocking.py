@@ -0,0 +1,210 @@
+import os
+import json
+from collections import deque
+
+
+# =========================
+# Blokování nepotřebných požadavků v headless prohlížeči
+# Pro přečtení inline scriptu nepotřebujeme obrázky, fonty, CSS ani reklamy/trackery.
+# Chromium: Network.setBlockedURLs přes DevTools (typy souborů i hosty).
+# Firefox: preference (obrázky, fonty, CSS) + vestavěná ochrana proti sledování;
+#   hosty z WS_BLOCK_DENY Firefox blokovat neumí – report to uvádí (blocking="prefs_only").
+#
+# Nastavení přes proměnné prostředí (čárkou oddělené seznamy):
+#   WS_BLOCK_RESOURCES=0   vypne blokování úplně
+#   WS_BLOCK_TYPES         typy zdrojů (výchozí image,font,stylesheet,media)
+#   WS_BLOCK_DENY          další blokované hosty
+#   WS_BLOCK_ALLOW         typy zdrojů, hosty nebo vzory, které se nikdy neblokují (mají přednost)
+#   WS_BLOCK_SIZE_EST      odhad velikosti blokovaného požadavku podle typu, např. "image=20000,script=30000"
+# =========================
+
+RESOURCE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.svg", "*.ico"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+    "media": ["*.mp4", "*.webm", "*.m3u8", "*.mp3"],
+}
+
+DEFAULT_DENY_HOSTS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com", "adservice.google.com",
+    "googletagmanager.com", "google-analytics.com", "googletagservices.com",
+    "facebook.net", "connect.facebook.net", "scorecardresearch.com", "quantserve.com",
+    "criteo.com", "criteo.net", "adnxs.com", "amazon-adsystem.com", "pubmatic.com",
+    "rubiconproject.com", "openx.net", "casalemedia.com", "taboola.com", "outbrain.com",
+    "moatads.com", "hotjar.com", "mc.yandex.ru", "cookielaw.org", "onetrust.com",
+]
+
+# Posledních N reportů načtení (počty požadavků, přenesené bajty, blokované požadavky a jejich odhad v bajtech)
+LOAD_REPORTS = deque(maxlen=200)
+
+# Režim blokování v reportu:
+#   devtools    Chromium – typy i hosty přes DevTools, počty blokovaných z výkonnostního logu
+#   prefs_only  Firefox – jen typy přes preference, hosty z WS_BLOCK_DENY se neblokují
+#               a počet blokovaných požadavků nelze zjistit
+#   disabled    WS_BLOCK_RESOURCES=0
+FIREFOX_BLOCKING_NOTE = ("Firefox: hosty z WS_BLOCK_DENY se neblokují (jen vestavěná ochrana proti sledování), "
+                         "blokované požadavky nelze spočítat")
+
+# Blokovaný požadavek se nestáhne → skutečnou velikost (Content-Length, Resource Timing) nezjistíme.
+# Ušetřené bajty se proto odhadují: počet blokovaných požadavků podle typu (DevTools ResourceType)
+# × typická přenesená velikost jednoho požadavku daného typu (řádově mediány z HTTP Archive).
+DEFAULT_BLOCKED_SIZE_ESTIMATES = {"image": 15000, "font": 30000, "stylesheet": 10000, "media": 200000,
+                                  "script": 20000, "other": 2000}
+
+_RESOURCE_STATS_JS = """
+var entries = performance.getEntriesByType('resource');
+var nav = performance.getEntriesByType('navigation')[0];
+var bytes = nav ? (nav.transferSize || 0) : 0;
+for (var i = 0; i < entries.length; i++) { bytes += entries[i].transferSize || 0; }
+return {requests: entries.length + (nav ? 1 : 0), bytes: bytes};
+"""
+
+
+def _env_list(name: str, default=None):
+    raw = os.environ.get(name)
+    if raw is None:
+        return list(default or [])
+    return [item.strip() for item in raw.split(",") if item.strip()]
+
+
+class BlockingConfig:
+    def __init__(self, enabled=True, resource_types=None, deny_hosts=None, allow=None):
+        self.enabled = enabled
+        self.resource_types = list(resource_types if resource_types is not None else RESOURCE_PATTERNS)
+        self.deny_hosts = list(deny_hosts if deny_hosts is not None else DEFAULT_DENY_HOSTS)
+        self.allow = list(allow or [])
+
+    @classmethod
+    def from_env(cls):
+        return cls(
+            enabled=os.environ.get("WS_BLOCK_RESOURCES", "1") != "0",
+            resource_types=_env_list("WS_BLOCK_TYPES", RESOURCE_PATTERNS),
+            deny_hosts=DEFAULT_DENY_HOSTS + _env_list("WS_BLOCK_DENY"),
+            allow=_env_list("WS_BLOCK_ALLOW"),
+        )
+
+    def blocks(self, resource_type: str) -> bool:
+        return self.enabled and resource_type in self.resource_types and resource_type not in self.allow
+
+    def url_patterns(self):
+        if not self.enabled:
+            return []
+        patterns = []
+        for resource_type in self.resource_types:
+            if self.blocks(resource_type):
+                patterns += RESOURCE_PATTERNS.get(resource_type, [])
+        patterns += [f"*{host}*" for host in self.deny_hosts]
+        return [p for p in patterns if not any(a in p for a in self.allow)]
+
+
+BLOCKING = BlockingConfig.from_env()
+
+
+def _parse_size_estimates(raw: str) -> dict:
+    estimates = dict(DEFAULT_BLOCKED_SIZE_ESTIMATES)
+    for item in raw.split(","):
+        name, _, size = item.partition("=")
+        if name.strip() and size.strip():
+            estimates[name.strip().lower()] = int(size)
+    return estimates
+
+
+BLOCKED_SIZE_ESTIMATES = _parse_size_estimates(os.environ.get("WS_BLOCK_SIZE_EST", ""))
+
+
+# ---------- Chromium ----------
+def apply_chrome_options(chrome_options, config: BlockingConfig = BLOCKING):
+    if not config.enabled:
+        return
+    prefs = {}
+    if config.blocks("image"):
+        prefs["profile.managed_default_content_settings.images"] = 2
+    if prefs:
+        chrome_options.add_experimental_option("prefs", prefs)
+    # Výkonnostní log kvůli počtu zablokovaných požadavků v reportu
+    chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+
+
+def apply_chrome_blocking(driver, config: BlockingConfig = BLOCKING):
+    patterns = config.url_patterns()
+    if not patterns:
+        return
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+
+
+# ---------- Firefox ----------
+def apply_firefox_options(options, config: BlockingConfig = BLOCKING):
+    if not config.enabled:
+        return
+    if config.blocks("image"):
+        options.set_preference("permissions.default.image", 2)
+    if config.blocks("font"):
+        options.set_preference("browser.display.use_document_fonts", 0)
+    if config.blocks("stylesheet"):
+        options.set_preference("permissions.default.stylesheet", 2)
+    if config.blocks("media"):
+        options.set_preference("media.autoplay.default", 5)
+    # Firefox neumí blokovat libovolné hosty přes preference – reklamy a trackery
+    # pokryje vestavěná ochrana proti sledování (seznam Disconnect)
+    extra_hosts = [h for h in config.deny_hosts if h not in DEFAULT_DENY_HOSTS]
+    if extra_hosts:
+        print(f"⚠️ Firefox: WS_BLOCK_DENY ({', '.join(extra_hosts)}) se neuplatní – blokování hostů umí jen Chromium")
+    if config.deny_hosts:
+        options.set_preference("privacy.trackingprotection.enabled", True)
+        options.set_preference("privacy.trackingprotection.socialtracking.enabled", True)
+
+
+# ---------- report ----------
+def _drain_performance_log(driver):
+    try:
+        return driver.get_log("performance")
+    except Exception:
+        # Firefox / prohlížeč bez výkonnostního logu
+        return None
+
+
+def start_load_report(driver):
+    # Zahodí záznamy z předchozího načtení (prohlížeče se v poolu opakovaně používají)
+    _drain_performance_log(driver)
+
+
+def _blocking_mode(driver, config: BlockingConfig) -> str:
+    if not config.enabled:
+        return "disabled"
+    capabilities = getattr(driver, "capabilities", None) or {}
+    return "prefs_only" if str(capabilities.get("browserName", "")).lower() == "firefox" else "devtools"
+
+
+def collect_load_report(driver, match_url: str = "", config: BlockingConfig = BLOCKING) -> dict:
+    # blocked_bytes_estimate = odhad (počet blokovaných × BLOCKED_SIZE_ESTIMATES), ne změřené bajty
+    mode = _blocking_mode(driver, config)
+    report = {"match_url": match_url, "requests": None, "bytes": None, "blocking": mode,
+              "blocking_note": FIREFOX_BLOCKING_NOTE if mode == "prefs_only" else None,
+              "blocked_requests": None, "blocked_by_type": None, "blocked_bytes_estimate": None}
+    try:
+        stats = driver.execute_script(_RESOURCE_STATS_JS) or {}
+        report["requests"] = stats.get("requests")
+        report["bytes"] = stats.get("bytes")
+    except Exception:
+        pass
+
+    logs = _drain_performance_log(driver) if mode == "devtools" else None
+    if logs is not None:
+        by_type = {}
+        for entry in logs:
+            message = entry.get("message", "")
+            if "Network.loadingFailed" not in message:
+                continue
+            params = json.loads(message).get("message", {}).get("params", {})
+            if params.get("blockedReason"):
+                resource_type = (params.get("type") or "other").lower()
+                by_type[resource_type] = by_type.get(resource_type, 0) + 1
+        report["blocked_requests"] = sum(by_type.values())
+        report["blocked_by_type"] = by_type
+        report["blocked_bytes_estimate"] = sum(
+            count * BLOCKED_SIZE_ESTIMATES.get(t, BLOCKED_SIZE_ESTIMATES["other"]) for t, count in by_type.items()
+        )
+
+    LOAD_REPORTS.append(report)
+    return report
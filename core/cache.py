@@ -0,0 +1,211 @@
+import os
+import re
+import json
+import time
+import threading
+
+from core.parquet_io import write_parquet, read_parquet
+from core.schema import MatchFrames, apply_event_schema
+
+
+# =========================
+# Diskový cache událostí (Parquet + malý JSON index)
+# Klíč: matchId + jmenný prostor parseru + verze parseru.
+# Každá tabulka z MatchFrames (events, match, ...) ve vlastním souboru {klíč}.{tabulka}.parquet.
+# Dohrané zápasy se nemění → platí napořád (jen LRU podle velikosti),
+# živé zápasy mají TTL.
+# Index drží i paměť procesu; zásah v cache soubor nepřepisuje (last_access se zapíše dávkově).
+# =========================
+
+CACHE_DIR = os.environ.get("WS_CACHE_DIR", os.path.join(".cache", "events"))
+CACHE_MAX_BYTES = int(float(os.environ.get("WS_CACHE_MAX_MB", "512")) * 1024 * 1024)
+LIVE_TTL_SECONDS = int(os.environ.get("WS_CACHE_LIVE_TTL", "120"))
+# Čas posledního přístupu (LRU) se zapisuje do index.json nejvýš jednou za N sekund
+INDEX_FLUSH_SECONDS = float(os.environ.get("WS_CACHE_INDEX_FLUSH", "30"))
+
+_MATCH_ID_RE = re.compile(r"/matches/(\d+)", re.IGNORECASE)
+_INDEX_LOCK = threading.Lock()
+# Index v paměti podle cesty: (mtime_ns, velikost) souboru → dict; soubor se čte znovu,
+# jen když ho mezitím změnil jiný proces (prefetch.py)
+_INDEXES = {}
+# Přístupy ještě nezapsané do souboru: cesta → {klíč: last_access}
+_PENDING_ACCESS = {}
+_LAST_FLUSH = {}
+
+
+def match_id_from_url(match_url: str):
+    m = _MATCH_ID_RE.search(match_url or "")
+    return int(m.group(1)) if m else None
+
+
+def is_finished(ft_score) -> bool:
+    # WhoScored vyplní ftScore až po konci zápasu (např. "2 : 1")
+    return isinstance(ft_score, str) and ft_score.strip() != ""
+
+
+class EventCache:
+    def __init__(self, namespace: str, parser_version: int, root: str = CACHE_DIR,
+                 max_bytes: int = CACHE_MAX_BYTES, live_ttl: int = LIVE_TTL_SECONDS):
+        self.namespace = namespace
+        self.parser_version = parser_version
+        self.root = root
+        self.max_bytes = max_bytes
+        self.live_ttl = live_ttl
+        self.index_path = os.path.join(root, "index.json")
+
+    # ---------- index ----------
+    # Volat jen pod _INDEX_LOCK
+    def _index_stamp(self):
+        try:
+            st = os.stat(self.index_path)
+        except FileNotFoundError:
+            return None
+        return st.st_mtime_ns, st.st_size
+
+    def _load_index(self) -> dict:
+        stamp = self._index_stamp()
+        cached = _INDEXES.get(self.index_path)
+        if cached is not None and cached[0] == stamp:
+            index = cached[1]
+        else:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    index = json.load(f)
+            except (FileNotFoundError, json.JSONDecodeError):
+                index = {}
+            _INDEXES[self.index_path] = (stamp, index)
+        for key, accessed in _PENDING_ACCESS.get(self.index_path, {}).items():
+            if key in index:
+                index[key]["last_access"] = max(index[key].get("last_access", 0), accessed)
+        return index
+
+    def _save_index(self, index: dict):
+        os.makedirs(self.root, exist_ok=True)
+        tmp_path = self.index_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(index, f)
+        os.replace(tmp_path, self.index_path)
+        _INDEXES[self.index_path] = (self._index_stamp(), index)
+        _PENDING_ACCESS.pop(self.index_path, None)
+        _LAST_FLUSH[self.index_path] = time.time()
+
+    def _touch(self, index: dict, key: str, now: float):
+        # Zásah v cache mění jen paměť; soubor se přepíše při put/evict nebo po INDEX_FLUSH_SECONDS
+        _PENDING_ACCESS.setdefault(self.index_path, {})[key] = now
+        index[key]["last_access"] = now
+        if now - _LAST_FLUSH.get(self.index_path, 0) >= INDEX_FLUSH_SECONDS:
+            self._save_index(index)
+
+    def flush(self):
+        # Zapíše odložené časy přístupů (např. na konci prefetch.py)
+        with _INDEX_LOCK:
+            if _PENDING_ACCESS.get(self.index_path):
+                self._save_index(self._load_index())
+
+    def _key(self, match_id) -> str:
+        return f"{self.namespace}-{int(match_id)}-v{self.parser_version}"
+
+    def _remove_entry(self, index: dict, key: str):
+        entry = index.pop(key, None)
+        if not entry:
+            return
+        for name in entry.get("files", []):
+            try:
+                os.remove(os.path.join(self.root, name))
+            except FileNotFoundError:
+                pass
+
+    def _expired(self, entry: dict, now: float) -> bool:
+        return bool(entry.get("live")) and now - entry.get("created", 0) > self.live_ttl
+
+    # ---------- API ----------
+    def has(self, match_id) -> bool:
+        # Jen podle indexu (bez čtení Parquetu) – pro prefetch a přehledy
+        if match_id is None:
+            return False
+        with _INDEX_LOCK:
+            entry = self._load_index().get(self._key(match_id))
+        return entry is not None and not self._expired(entry, time.time())
+
+    def get(self, match_id):
+        if match_id is None:
+            return None
+        key = self._key(match_id)
+        with _INDEX_LOCK:
+            index = self._load_index()
+            entry = index.get(key)
+            if entry is None:
+                return None
+            now = time.time()
+            if self._expired(entry, now):
+                self._remove_entry(index, key)
+                self._save_index(index)
+                return None
+            tables, created = list(entry.get("tables", [])), entry.get("created")
+        # Parquet se čte mimo zámek – souběžné načtení jiných zápasů na sebe nečekají
+        try:
+            frames = MatchFrames(**{
+                field: read_parquet(os.path.join(self.root, f"{key}.{field}.parquet"))
+                for field in tables
+            })
+        except (OSError, ValueError, TypeError):
+            # Poškozený / ručně smazaný záznam – bereme jako miss (pokud ho mezitím nepřepsal put)
+            with _INDEX_LOCK:
+                index = self._load_index()
+                entry = index.get(key)
+                if entry is not None and entry.get("created") == created:
+                    self._remove_entry(index, key)
+                    self._save_index(index)
+            return None
+        with _INDEX_LOCK:
+            index = self._load_index()
+            if key in index:
+                self._touch(index, key, now)
+        # Kategorie se v Parquetu ukládají jako dictionary, ale zbytek schématu doplníme
+        return frames._replace(events=apply_event_schema(frames.events))
+
+    def put(self, match_id, frames: MatchFrames, live: bool):
+        if match_id is None or frames.events is None or frames.events.empty:
+            return
+        key = self._key(match_id)
+        os.makedirs(self.root, exist_ok=True)
+        with _INDEX_LOCK:
+            tables, files, size = [], [], 0
+            for field, table in frames._asdict().items():
+                if table is None:
+                    continue
+                name = f"{key}.{field}.parquet"
+                size += write_parquet(table, os.path.join(self.root, name))
+                tables.append(field)
+                files.append(name)
+
+            now = time.time()
+            index = self._load_index()
+            index[key] = {
+                "match_id": int(match_id),
+                "namespace": self.namespace,
+                "parser_version": self.parser_version,
+                "tables": tables,
+                "files": files,
+                "size": size,
+                "live": bool(live),
+                "created": now,
+                "last_access": now,
+            }
+            self._evict(index, keep=key)
+            self._save_index(index)
+
+    def _evict(self, index: dict, keep: str):
+        now = time.time()
+        for key in [k for k, e in index.items() if self._expired(e, now)]:
+            self._remove_entry(index, key)
+
+        total = sum(e.get("size", 0) for e in index.values())
+        # LRU – nejdéle nepoužité záznamy jdou pryč první
+        for key in sorted(index, key=lambda k: index[k].get("last_access", 0)):
+            if total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            total -= index[key].get("size", 0)
+            self._remove_entry(index, key)
@@ -0,0 +1,178 @@
+import os
+import time
+import queue
+import threading
+from contextlib import contextmanager
+
+from core.metrics import span, trace
+
+
+# =========================
+# Sdílený pool předem spuštěných headless prohlížečů
+# - jeden pool na prohlížeč a proces (core/ui.py get_driver_pool, zavření přes atexit)
+# - health check při výdeji, recyklace po N stránkách
+# - po každém použití reset stavu (cookies, storage, další okna, about:blank)
+# =========================
+
+POOL_SIZE = int(os.environ.get("WS_DRIVER_POOL_SIZE", "2"))
+MAX_PAGES_PER_DRIVER = int(os.environ.get("WS_DRIVER_MAX_PAGES", "20"))
+CHECKOUT_TIMEOUT = float(os.environ.get("WS_DRIVER_CHECKOUT_TIMEOUT", "120"))
+# 1 = po vytvoření poolu (první načtení přes prohlížeč) nastartovat na pozadí i zbytek poolu;
+# výchozí 0 – prohlížeče startují jen tehdy, když je načtení opravdu potřebuje
+DRIVER_PREWARM = os.environ.get("WS_DRIVER_PREWARM", "0") == "1"
+
+_CLEAR_STORAGE_JS = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def _quit_quietly(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+
+
+class DriverPool:
+    def __init__(self, factory, size: int = POOL_SIZE, max_pages: int = MAX_PAGES_PER_DRIVER,
+                 checkout_timeout: float = CHECKOUT_TIMEOUT):
+        self.factory = factory
+        self.size = max(1, size)
+        self.max_pages = max(1, max_pages)
+        self.checkout_timeout = checkout_timeout
+        self._idle = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+        self._lock = threading.Lock()
+        self._pages = {}  # id(driver) -> počet načtených stránek
+        self._alive = 0
+
+    # ---------- životní cyklus prohlížečů ----------
+    def _create(self):
+        # Místo v poolu už rezervoval volající (_alive += 1 pod zámkem) – při chybě ho vrátíme
+        try:
+            with span("driver_start"):
+                driver = self.factory()
+        except Exception:
+            with self._lock:
+                self._alive -= 1
+            raise
+        with self._lock:
+            self._pages[id(driver)] = 0
+        return driver
+
+    def _discard(self, driver):
+        with self._lock:
+            self._pages.pop(id(driver), None)
+            self._alive -= 1
+        _quit_quietly(driver)
+
+    def _add_idle(self):
+        # Spouští se v pozadí – první uživatel nečeká na start prohlížeče
+        with self._lock:
+            if self._alive >= self.size:
+                return
+            self._alive += 1  # rezervace místa, než prohlížeč naběhne
+        try:
+            with trace("driver_start", background=True):
+                driver = self.factory()
+        except Exception as e:
+            print(f"⚠️ Předehřátí prohlížeče selhalo: {e}")
+            with self._lock:
+                self._alive -= 1
+            return
+        with self._lock:
+            self._pages[id(driver)] = 0
+        self._idle.put(driver)
+
+    def prewarm(self):
+        for _ in range(self.size):
+            threading.Thread(target=self._add_idle, daemon=True).start()
+
+    @staticmethod
+    def is_healthy(driver) -> bool:
+        # Selenium až tady: modul se načte jen tehdy, když pool opravdu drží prohlížeč
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            return driver.execute_script("return 1") == 1
+        except WebDriverException:
+            return False
+
+    def _reset(self, driver) -> bool:
+        from selenium.common.exceptions import WebDriverException
+
+        try:
+            handles = driver.window_handles
+            for handle in handles[1:]:
+                driver.switch_to.window(handle)
+                driver.close()
+            driver.switch_to.window(handles[0])
+            driver.execute_script(_CLEAR_STORAGE_JS)
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except WebDriverException:
+            return False
+
+    # ---------- výdej / vrácení ----------
+    def _acquire(self):
+        give_up = time.monotonic() + self.checkout_timeout
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                with self._lock:
+                    can_create = self._alive < self.size
+                    if can_create:
+                        self._alive += 1  # rezervace místa, než prohlížeč naběhne
+                if can_create:
+                    return self._create()
+                # Prohlížeče ještě startují na pozadí – počkáme na první volný
+                if time.monotonic() > give_up:
+                    raise TimeoutError("Prohlížeč z poolu nebyl včas k dispozici")
+                try:
+                    driver = self._idle.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+            if self.is_healthy(driver):
+                return driver
+            self._discard(driver)
+
+    def _release(self, driver, healthy: bool):
+        with self._lock:
+            pages = self._pages.get(id(driver), 0)
+        if healthy and pages < self.max_pages and self._reset(driver):
+            self._idle.put(driver)
+            return
+        # Rozbitý nebo „opotřebovaný“ prohlížeč nahradíme novým na pozadí
+        self._discard(driver)
+        threading.Thread(target=self._add_idle, daemon=True).start()
+
+    @contextmanager
+    def checkout(self):
+        if not self._slots.acquire(timeout=self.checkout_timeout):
+            raise TimeoutError("Žádný volný prohlížeč v poolu")
+        driver = None
+        healthy = True
+        try:
+            with span("driver_checkout"):
+                driver = self._acquire()
+            yield driver
+        except Exception:
+            healthy = driver is not None and self.is_healthy(driver)
+            raise
+        finally:
+            if driver is not None:
+                with self._lock:
+                    if id(driver) in self._pages:
+                        self._pages[id(driver)] += 1
+                self._release(driver, healthy)
+            self._slots.release()
+
+    def close(self):
+        while True:
+            try:
+                self._discard(self._idle.get_nowait())
+            except queue.Empty:
+                break
@@ -0,0 +1,71 @@
+import os
+import shutil
+
+from core.blocking import apply_chrome_blocking, apply_chrome_options, apply_firefox_options
+
+
+# =========================
+# Továrny headless prohlížečů pro DriverPool (30s.py: Firefox, pages/LM.py: Chromium)
+# Selenium se importuje až při startu prohlížeče – při zásahu do cache
+# nebo HTTP načtení se vůbec nenačte.
+# =========================
+
+def make_firefox_driver():
+    import geckodriver_autoinstaller
+    from selenium import webdriver
+
+    geckodriver_autoinstaller.install()
+    options = webdriver.FirefoxOptions()
+    options.add_argument("--headless")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    apply_firefox_options(options)  # bez obrázků, fontů, CSS a trackerů
+    driver = webdriver.Firefox(options=options)
+    return driver
+
+
+def make_chrome_driver():
+    from selenium import webdriver
+    from selenium.webdriver.chrome.options import Options as ChromeOptions
+    from selenium.webdriver.chrome.service import Service as ChromeService
+
+    chrome_options = ChromeOptions()
+    chrome_options.add_argument("--headless=new")  # Nový headless režim
+    chrome_options.add_argument("--no-sandbox")
+    chrome_options.add_argument("--disable-dev-shm-usage")
+    chrome_options.add_argument("--disable-gpu")
+    chrome_options.add_argument("--window-size=1920,1080")
+    chrome_options.add_argument("--disable-web-security")
+    chrome_options.add_argument("--disable-features=VizDisplayCompositor")
+
+    # Anti-detekce nastavení
+    chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+
+    # Bez obrázků, fontů, CSS a reklam/trackerů (viz core/blocking.py)
+    apply_chrome_options(chrome_options)
+
+    # Nastavení cesty k binárce pro různá prostředí
+    for bin_path in ("/usr/bin/chromium", "/usr/bin/chromium-browser", "/usr/bin/google-chrome"):
+        if os.path.exists(bin_path):
+            chrome_options.binary_location = bin_path
+            break
+
+    # chromedriver z PATH (Streamlit Cloud: balík chromium-driver)
+    chromedriver_path = shutil.which("chromedriver") or "/usr/bin/chromedriver"
+    service = ChromeService(executable_path=chromedriver_path)
+
+    driver = webdriver.Chrome(service=service, options=chrome_options)
+
+    # Skrytí webdriver vlastností
+    driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+    apply_chrome_blocking(driver)
+
+    return driver
+
+
+DRIVER_FACTORIES = {
+    "firefox": make_firefox_driver,
+    "chrome": make_chrome_driver,
+}
@@ -0,0 +1,237 @@
+import os
+import re
+import json
+import time
+import threading
+
+import pandas as pd
+
+from core.parquet_io import write_parquet, decode_json_columns, json_columns
+from core.schema import MatchFrames, apply_event_schema, match_info
+
+
+# =========================
+# Lokální sloupcové úložiště událostí pro analýzy přes celou sezónu
+#   <root>/<namespace>/season=<s>/league=<l>/teamId=<id>/match_<matchId>.parquet
+#   <root>/<namespace>/season=<s>/league=<l>/qualifiers/match_<matchId>.parquet
+#       qualifiers v dlouhém formátu s klíčem (matchId, teamId, eventId) – eventId
+#       čísluje WhoScored po týmech, pozice v tabulce (event_index) se mezi soubory nezachová
+#   <root>/<namespace>/manifest.jsonl   (append-only, poslední záznam pro matchId platí,
+#                                       obsahuje i řádek tabulky zápasu)
+# Čtení načte jen potřebné sloupce a partition; filtry na tým a typ akce
+# se posílají do Parquetu (predicate pushdown). Qualifiers jako široké sloupce
+# jen na vyžádání: read(..., qualifiers=["Cross", …]) nebo qualifiers=True pro všechny.
+# =========================
+
+STORE_DIR = os.environ.get("WS_STORE_DIR", os.path.join(".cache", "store"))
+STORE_ENABLED = os.environ.get("WS_STORE_ENABLED", "1") != "0"
+
+PARTITION_COLUMNS = ["season", "league", "teamId"]
+# Sloupec s názvem akce podle jmenného prostoru (ACTION_COL v core/loader_30s.py a core/loader_lm.py)
+ACTION_COLUMNS = {"30s": "actionType", "lm": "type"}
+QUALIFIER_KEYS = ["matchId", "teamId", "eventId"]
+
+_UNSAFE_RE = re.compile(r"[\\/:*?\"<>|=%]+")
+_MANIFEST_LOCK = threading.Lock()
+
+
+def partition_value(value) -> str:
+    # "2025/2026" → "2025-2026"; prázdné hodnoty do společné partition
+    text = "" if value is None or (isinstance(value, float) and pd.isna(value)) else str(value).strip()
+    return _UNSAFE_RE.sub("-", text) or "unknown"
+
+
+class EventStore:
+    def __init__(self, namespace: str, root: str = STORE_DIR, action_column: str = None):
+        self.namespace = namespace
+        self.action_column = action_column or ACTION_COLUMNS.get(namespace, "type")
+        self.root = os.path.join(root, namespace)
+        self.manifest_path = os.path.join(self.root, "manifest.jsonl")
+
+    # ---------- manifest ----------
+    def manifest(self) -> dict:
+        entries = {}
+        try:
+            with open(self.manifest_path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entry = json.loads(line)
+                        entries[entry["match_id"]] = entry
+        except FileNotFoundError:
+            pass
+        return entries
+
+    def has_match(self, match_id) -> bool:
+        return match_id is not None and int(match_id) in self.manifest()
+
+    # ---------- zápis ----------
+    def write_match(self, frames: MatchFrames):
+        events_df = frames.events
+        if events_df is None or events_df.empty or "matchId" not in events_df:
+            return None
+        match_id = int(events_df["matchId"].iloc[0])
+        info = match_info(frames.match)
+        season = partition_value(info.get("season"))
+        league = partition_value(info.get("league"))
+
+        files = []
+        data_cols = [c for c in events_df.columns if c not in PARTITION_COLUMNS]
+        for team_id, part in events_df.groupby("teamId", sort=False):
+            rel_dir = os.path.join(f"season={season}", f"league={league}", f"teamId={int(team_id)}")
+            os.makedirs(os.path.join(self.root, rel_dir), exist_ok=True)
+            rel_path = os.path.join(rel_dir, f"match_{match_id}.parquet")
+            write_parquet(part[data_cols], os.path.join(self.root, rel_path))
+            files.append(rel_path)
+
+        qualifiers_path = None
+        quals = frames.qualifiers
+        if quals is not None and not quals.empty and "eventId" in events_df:
+            # event_index = pozice v events_df → klíč události, který platí i mimo tento zápis
+            keys = events_df[["teamId", "eventId"]].iloc[quals["event_index"].to_numpy()]
+            table = pd.DataFrame({
+                "matchId": pd.Series(match_id, index=range(len(quals)), dtype="int32"),
+                "teamId": keys["teamId"].to_numpy(),
+                "eventId": keys["eventId"].to_numpy(),
+                "qualifier": quals["qualifier"].to_numpy(),
+                "value": quals["value"].to_numpy(),
+            })
+            rel_dir = os.path.join(f"season={season}", f"league={league}", "qualifiers")
+            os.makedirs(os.path.join(self.root, rel_dir), exist_ok=True)
+            qualifiers_path = os.path.join(rel_dir, f"match_{match_id}.parquet")
+            write_parquet(table, os.path.join(self.root, qualifiers_path))
+
+        entry = {
+            "match_id": match_id,
+            "season": season,
+            "league": league,
+            "team_ids": sorted(int(t) for t in events_df["teamId"].dropna().unique()),
+            "files": files,
+            "qualifiers": qualifiers_path,
+            "rows": int(len(events_df)),
+            "match": info,
+            "written_at": time.time(),
+        }
+        with _MANIFEST_LOCK:
+            with open(self.manifest_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(entry) + "\n")
+        return entry
+
+    # ---------- čtení ----------
+    def _entries(self, seasons=None, leagues=None, match_ids=None) -> list:
+        # Pruning partition přes manifest – bez procházení adresářů
+        seasons = {partition_value(s) for s in seasons} if seasons else None
+        leagues = {partition_value(lg) for lg in leagues} if leagues else None
+        match_ids = {int(m) for m in match_ids} if match_ids else None
+        return [
+            entry for entry in self.manifest().values()
+            if (not seasons or entry["season"] in seasons)
+            and (not leagues or entry["league"] in leagues)
+            and (not match_ids or entry["match_id"] in match_ids)
+        ]
+
+    def files(self, seasons=None, leagues=None, team_ids=None, match_ids=None) -> list:
+        team_ids = {int(t) for t in team_ids} if team_ids else None
+        out = []
+        for entry in self._entries(seasons, leagues, match_ids):
+            for rel_path in entry["files"]:
+                team_dir = os.path.basename(os.path.dirname(rel_path))
+                if team_ids and int(team_dir.split("=", 1)[1]) not in team_ids:
+                    continue
+                out.append(os.path.join(self.root, rel_path))
+        return out
+
+    def read_qualifiers(self, names=None, seasons=None, leagues=None, team_ids=None, match_ids=None) -> pd.DataFrame:
+        # Dlouhý formát: matchId, teamId, eventId, qualifier, value (names=None → všechny)
+        import pyarrow.dataset as ds
+
+        paths = [os.path.join(self.root, entry["qualifiers"])
+                 for entry in self._entries(seasons, leagues, match_ids) if entry.get("qualifiers")]
+        if not paths:
+            return pd.DataFrame(columns=QUALIFIER_KEYS + ["qualifier", "value"])
+        expr = None
+        if team_ids:
+            expr = ds.field("teamId").isin([int(t) for t in team_ids])
+        if names is not None:
+            cond = ds.field("qualifier").isin(list(names))
+            expr = cond if expr is None else expr & cond
+        # Hodnoty jsou v některých souborech text, v jiných JSON (čísla) → lenient
+        table = ds.dataset(paths, format="parquet").to_table(filter=expr)
+        out = decode_json_columns(table, columns=["value"], lenient=True)
+        out["qualifier"] = out["qualifier"].astype("category")
+        return out
+
+    def _join_qualifiers(self, events: pd.DataFrame, names, **filters) -> pd.DataFrame:
+        # Široké sloupce jako project_qualifiers: hodnota qualifieru, jinak True; bez qualifieru NaN
+        quals = self.read_qualifiers(names=None if names is True else names, **filters)
+        if quals.empty or events.empty:
+            return events
+        quals = quals.assign(value=quals["value"].where(quals["value"].notna(), True),
+                             qualifier=quals["qualifier"].astype(str))
+        wide = (quals.drop_duplicates(QUALIFIER_KEYS + ["qualifier"], keep="last")
+                .pivot(index=QUALIFIER_KEYS, columns="qualifier", values="value")
+                .reset_index())
+        wide.columns.name = None
+        for key in QUALIFIER_KEYS:
+            wide[key] = wide[key].astype(events[key].dtype)
+        return events.merge(wide, on=QUALIFIER_KEYS, how="left")
+
+    def read(self, columns=None, team_ids=None, action_types=None, seasons=None, leagues=None,
+             match_ids=None, action_column: str = None, qualifiers=None) -> pd.DataFrame:
+        # action_column=None → sloupec akce daného jmenného prostoru (30s "actionType", LM "type")
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+        import pyarrow.parquet as pq
+
+        paths = self.files(seasons, leagues, team_ids, match_ids)
+        if not paths:
+            return pd.DataFrame(columns=columns or [])
+
+        # Zápasy mají různé sady sloupců → sjednocené schéma (chybějící sloupce = null)
+        schemas = [pq.read_schema(p) for p in paths]
+        json_cols = sorted({c for sch in schemas for c in json_columns(sch)})
+        schema = pa.unify_schemas([sch.remove_metadata() for sch in schemas], promote_options="permissive")
+        partitioning = ds.partitioning(
+            pa.schema([("season", pa.string()), ("league", pa.string()), ("teamId", pa.int64())]),
+            flavor="hive",
+        )
+        for field in partitioning.schema:
+            if schema.get_field_index(field.name) == -1:
+                schema = schema.append(field)
+        dataset = ds.dataset(paths, schema=schema, format="parquet",
+                             partitioning=partitioning, partition_base_dir=self.root)
+
+        expr = None
+        if team_ids:
+            expr = ds.field("teamId").isin([int(t) for t in team_ids])
+        if action_types:
+            action_column = action_column or self.action_column
+            field = schema.field(action_column) if action_column in schema.names else None
+            # Filtr na chybějící nebo ne-textový sloupec (např. JSON dict 'type' v 30s) by tiše vrátil 0 řádků
+            if field is None:
+                raise ValueError(f"Sloupec akce '{action_column}' v úložišti '{self.namespace}' neexistuje")
+            value_type = field.type.value_type if pa.types.is_dictionary(field.type) else field.type
+            is_text = (pa.types.is_string(value_type) or pa.types.is_large_string(value_type)
+                       or getattr(pa.types, "is_string_view", lambda t: False)(value_type))
+            if action_column in json_cols or not is_text:
+                raise ValueError(f"Sloupec akce '{action_column}' v úložišti '{self.namespace}' "
+                                 f"není textový ({field.type}) – filtruj podle '{ACTION_COLUMNS.get(self.namespace)}'")
+            cond = ds.field(action_column).isin(list(action_types))
+            expr = cond if expr is None else expr & cond
+
+        if columns is not None:
+            if qualifiers:
+                # Klíč pro připojení qualifiers
+                columns = list(columns) + [k for k in QUALIFIER_KEYS if k not in columns]
+            columns = [c for c in columns if c in schema.names]
+        table = dataset.to_table(columns=columns, filter=expr)
+        events = apply_event_schema(decode_json_columns(table, columns=json_cols, lenient=True))
+        if qualifiers:
+            events = self._join_qualifiers(events, qualifiers, seasons=seasons, leagues=leagues,
+                                           team_ids=team_ids, match_ids=match_ids)
+        return events
+
+    def read_matches(self, seasons=None, leagues=None) -> pd.DataFrame:
+        # Tabulka zápasů (jeden řádek na zápas) rovnou z manifestu
+        rows = [entry["match"] for entry in self._entries(seasons, leagues) if entry.get("match")]
+        return pd.DataFrame(rows)
@@ -0,0 +1,117 @@
+import os
+import re
+import json
+
+from core.metrics import span
+
+
+# =========================
+# Vytažení dat zápasu z inline scriptu WhoScored
+#   require.config.params["args"] = {
+#       matchId: 1874065,
+#       matchCentreData: {...},
+#       matchCentreEventTypeJson: {...},
+#       formationIdNameMappings: {...}
+#   };
+# Klíče jsou JS identifikátory (bez uvozovek), hodnoty validní JSON. Hodnoty čteme
+# přes json.JSONDecoder.raw_decode – jeden lineární průchod v C, který správně
+# zvládá závorky uvnitř řetězců i escapování.
+#
+# V prohlížeči je objekt už vyhodnocený: match_centre_via_js ho vrátí jedním
+# execute_script jako JSON.stringify(require.config.params["args"]) → jeden json.loads,
+# bez přenosu innerHTML a hledání v textu. Text se parsuje jen jako záloha.
+#   WS_JS_EXTRACT=0   vypne čtení objektu (vždy text scriptu)
+# =========================
+
+JS_EXTRACT_ENABLED = os.environ.get("WS_JS_EXTRACT", "1") != "0"
+
+# null, pokud objekt (zatím) neexistuje nebo nemá matchId
+MATCH_ARGS_JS = """
+try {
+    var args = window.require && window.require.config && window.require.config.params
+        && window.require.config.params["args"];
+    return args && args.matchId ? JSON.stringify(args) : null;
+} catch (e) {
+    return null;
+}
+"""
+
+_KEY_RE = re.compile(r"""\s*(?:([A-Za-z_$][\w$]*)|"([^"\\]*)"|'([^'\\]*)')\s*:\s*""")
+_SEP_RE = re.compile(r"\s*,")
+_decoder = json.JSONDecoder()
+
+
+def extract_match_args(text: str) -> dict:
+    start = text.find("matchId") if text else -1
+    if start == -1:
+        raise ValueError("Text neobsahuje matchId")
+    if start > 0 and text[start - 1] in "\"'":
+        start -= 1
+
+    args = {}
+    pos = start
+    while True:
+        m = _KEY_RE.match(text, pos)
+        if not m:
+            break
+        key = m.group(1) or m.group(2) or m.group(3)
+        try:
+            value, pos = _decoder.raw_decode(text, m.end())
+        except json.JSONDecodeError:
+            # Hodnota není JSON (JS výraz) – dál už strukturu nečteme
+            break
+        args[key] = value
+        sep = _SEP_RE.match(text, pos)
+        if not sep:
+            break
+        pos = sep.end()
+
+    if not args:
+        raise ValueError("Nepodařilo se přečíst data zápasu za matchId")
+    return args
+
+
+def extract_match_centre(text: str) -> dict:
+    return match_centre_from_args(extract_match_args(text))
+
+
+def match_centre_from_args(args: dict) -> dict:
+    # matchCentreData rozbalíme na nejvyšší úroveň a doplníme ostatní klíče
+    # (matchId, matchCentreEventTypeJson, ...) – stejný tvar jako dřív
+    centre_key = "matchCentreData"
+    if not isinstance(args.get(centre_key), dict):
+        centre_key = next((k for k, v in args.items() if isinstance(v, dict)), None)
+    data = dict(args[centre_key]) if centre_key else {}
+    for k, v in args.items():
+        if k != centre_key and k not in data:
+            data[k] = v
+    return dict(sorted(data.items()))
+
+
+def match_centre_from_json(args_json: str):
+    # JSON z MATCH_ARGS_JS → stejný tvar jako extract_match_centre; None, pokud to nejsou data zápasu
+    try:
+        args = json.loads(args_json)
+    except (TypeError, ValueError):
+        return None
+    if not isinstance(args, dict) or not args.get("matchId"):
+        return None
+    return match_centre_from_args(args)
+
+
+def match_centre_via_js(driver):
+    # Data zápasu přímo z objektu stránky; None → použij text scriptu (extract_match_centre)
+    if not JS_EXTRACT_ENABLED:
+        return None
+    from selenium.common.exceptions import WebDriverException
+
+    with span("find_script", strategy="js_object") as s:
+        try:
+            args_json = driver.execute_script(MATCH_ARGS_JS)
+        except WebDriverException:
+            args_json = None
+        s["found"] = bool(args_json)
+    if not args_json:
+        return None
+    with span("json_parse", source="js_object"):
+        return match_centre_from_json(args_json)
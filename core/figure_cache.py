@@ -0,0 +1,127 @@
+import io
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+import pandas as pd
+
+
+# =========================
+# Cache vykreslených grafů (PNG bajty)
+# Klíč: matchId + teamId + druh grafu + styl + hash vstupních dat,
+# takže opakované zobrazení zápasu nebo změna rozložení nesahá na matplotlib.
+# Paměť: LRU omezené velikostí; volitelně i disk (přežije restart appky).
+#
+#   WS_FIGURE_CACHE_MB    limit paměťového LRU (výchozí 64)
+#   WS_FIGURE_CACHE_DIR   adresář diskové vrstvy (výchozí .cache/figures)
+#   WS_FIGURE_CACHE_DISK  0 = bez diskové vrstvy
+# =========================
+
+FIGURE_CACHE_MAX_BYTES = int(float(os.environ.get("WS_FIGURE_CACHE_MB", "64")) * 1024 * 1024)
+FIGURE_CACHE_DIR = os.environ.get("WS_FIGURE_CACHE_DIR", os.path.join(".cache", "figures"))
+FIGURE_CACHE_DISK = os.environ.get("WS_FIGURE_CACHE_DISK", "1") != "0"
+
+# Výchozí parametry PNG – stejné jako st.pyplot
+FIGURE_DPI = 200
+
+
+def data_hash(df: pd.DataFrame, columns=None) -> str:
+    # Hash jen sloupců, ze kterých graf kreslí (dict sloupce typu 'type' hashovat nejde)
+    if df is None or df.empty:
+        return "empty"
+    if columns is not None:
+        df = df[[c for c in columns if c in df]]
+    values = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    h = hashlib.blake2b(values.tobytes(), digest_size=16)
+    h.update(",".join(map(str, df.columns)).encode("utf-8"))
+    return h.hexdigest()
+
+
+def _key_id(value):
+    # numpy.int32 z tabulky zápasu i obyčejný int musí dát stejný klíč;
+    # textová id (např. "batch-…" v LM dávce) zůstávají beze změny
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def figure_key(match_id, team_id, kind: str, style: dict, digest: str) -> str:
+    match_id, team_id = _key_id(match_id), _key_id(team_id)
+    raw = json.dumps([match_id, team_id, kind, style, digest], sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def figure_to_png(fig, dpi: int = FIGURE_DPI) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=dpi, bbox_inches="tight")
+    return buf.getvalue()
+
+
+class FigureCache:
+    def __init__(self, max_bytes: int = FIGURE_CACHE_MAX_BYTES, disk_dir=FIGURE_CACHE_DIR if FIGURE_CACHE_DISK else None):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self._items = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.png")
+
+    def _remember(self, key: str, png: bytes):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self._bytes -= len(old)
+            self._items[key] = png
+            self._bytes += len(png)
+            while self._bytes > self.max_bytes and len(self._items) > 1:
+                _, evicted = self._items.popitem(last=False)
+                self._bytes -= len(evicted)
+
+    def get(self, key: str):
+        with self._lock:
+            png = self._items.get(key)
+            if png is not None:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return png
+        if self.disk_dir:
+            try:
+                with open(self._disk_path(key), "rb") as f:
+                    png = f.read()
+            except OSError:
+                png = None
+            if png is not None:
+                self._remember(key, png)
+                self.hits += 1
+                return png
+        self.misses += 1
+        return None
+
+    def put(self, key: str, png: bytes):
+        self._remember(key, png)
+        if self.disk_dir:
+            path = self._disk_path(key)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(png)
+            os.replace(tmp_path, path)
+
+    def get_or_render(self, key: str, render) -> bytes:
+        # render() → PNG bajty; volá se jen při miss
+        png = self.get(key)
+        if png is None:
+            png = render()
+            self.put(key, png)
+        return png
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"items": len(self._items), "bytes": self._bytes, "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,60 @@
+import os
+import re
+import csv
+import unicodedata
+
+
+# =========================
+# Sofascore match_id → WhoScored matchId
+# Soubor prefetch_map.csv (sofascore_id, whoscored_id) je zdroj pravdy a dá se doplnit ručně.
+# Chybějící páry se hledají na WhoScored stránkách s rozpisem zápasů týmu
+# (WS_PREFETCH_FIXTURES_URL, čárkou oddělené): odkaz /matches/<id>/live/<slug>
+# se bere, když slug končí "<domácí>-<hosté>" a odpovídá právě jeden odkaz.
+#
+#   WS_PREFETCH_MAP            cesta k mapovacímu souboru (výchozí prefetch_map.csv)
+#   WS_PREFETCH_FIXTURES_URL   stránky rozpisu týmů na WhoScored
+# =========================
+
+PREFETCH_MAP_PATH = os.environ.get("WS_PREFETCH_MAP", "prefetch_map.csv")
+PREFETCH_FIXTURES_URLS = [u.strip() for u in os.environ.get("WS_PREFETCH_FIXTURES_URL", "").split(",") if u.strip()]
+
+MAP_COLUMNS = ["sofascore_id", "whoscored_id", "home_team", "away_team", "date"]
+
+_MATCH_LINK_RE = re.compile(r"/matches/(\d+)/(?:live|show|preview|matchreport)/([a-z0-9-]+)", re.IGNORECASE)
+_NON_SLUG_RE = re.compile(r"[^a-z0-9]+")
+
+
+def slugify(name: str) -> str:
+    # "Slavia Praha" → "slavia-praha", bez diakritiky (stejně jako slug WhoScored)
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode("ascii")
+    return _NON_SLUG_RE.sub("-", text.lower()).strip("-")
+
+
+def load_map(path: str = PREFETCH_MAP_PATH) -> dict:
+    # sofascore_id → řádek mapy (dict)
+    if not os.path.exists(path):
+        return {}
+    with open(path, newline="", encoding="utf-8") as f:
+        return {int(row["sofascore_id"]): row for row in csv.DictReader(f) if row.get("whoscored_id")}
+
+
+def save_map(mapping: dict, path: str = PREFETCH_MAP_PATH):
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.DictWriter(f, fieldnames=MAP_COLUMNS, extrasaction="ignore")
+        writer.writeheader()
+        for sofascore_id in sorted(mapping, reverse=True):
+            writer.writerow(mapping[sofascore_id])
+    os.replace(tmp_path, path)
+
+
+def fixture_links(page_html: str) -> dict:
+    # WhoScored matchId → slug ze všech odkazů na zápasy na stránce
+    return {int(m.group(1)): m.group(2).lower() for m in _MATCH_LINK_RE.finditer(page_html or "")}
+
+
+def resolve_match(links: dict, home_team: str, away_team: str):
+    # Jednoznačná shoda "…-<domácí>-<hosté>" na konci slugu, jinak None
+    tail = f"{slugify(home_team)}-{slugify(away_team)}"
+    found = [ws_id for ws_id, slug in links.items() if slug == tail or slug.endswith("-" + tail)]
+    return found[0] if len(found) == 1 else None
@@ -0,0 +1,109 @@
+import os
+import json
+import time
+import hashlib
+import importlib.util
+import threading
+
+
+# =========================
+# Diskový cache HTTP odpovědí s revalidací (ETag / Last-Modified)
+# Uložená odpověď se posílá jako If-None-Match / If-Modified-Since; na 304 se
+# použije tělo z disku → opakované běhy a překrývající se backfilly stahují jen hlavičky.
+# Přenos gzip (a br, pokud je nainstalovaný balík brotli), opakování s backoffem
+# řeší session z core/http_fetch.make_session.
+#
+#   WS_HTTP_CACHE_DIR   adresář cache (výchozí .cache/http)
+#   WS_HTTP_CACHE       0 = vypnout
+# =========================
+
+HTTP_CACHE_DIR = os.environ.get("WS_HTTP_CACHE_DIR", os.path.join(".cache", "http"))
+HTTP_CACHE_ENABLED = os.environ.get("WS_HTTP_CACHE", "1") != "0"
+
+# "br" jen když ho urllib3 umí dekódovat (balík brotli nebo brotlicffi); jen zjištění, bez importu
+ACCEPT_ENCODING = ("gzip, br" if any(importlib.util.find_spec(m) for m in ("brotli", "brotlicffi"))
+                   else "gzip")
+
+
+class HttpCache:
+    def __init__(self, cache_dir: str = HTTP_CACHE_DIR, enabled: bool = HTTP_CACHE_ENABLED):
+        self.cache_dir = cache_dir
+        self.enabled = enabled
+        self.stats = {"hit": 0, "miss": 0, "error": 0, "bytes": 0, "saved_bytes": 0}
+        self._lock = threading.Lock()
+        if enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def _paths(self, url: str) -> tuple:
+        key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+        base = os.path.join(self.cache_dir, key[:2], key)
+        return base + ".body", base + ".meta.json"
+
+    def _load(self, url: str):
+        body_path, meta_path = self._paths(url)
+        try:
+            with open(meta_path, encoding="utf-8") as f:
+                meta = json.load(f)
+            with open(body_path, "rb") as f:
+                return meta, f.read()
+        except (OSError, ValueError):
+            return None, None
+
+    def _store(self, url: str, response):
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": time.time(),
+        }
+        if not meta["etag"] and not meta["last_modified"]:
+            return
+        body_path, meta_path = self._paths(url)
+        os.makedirs(os.path.dirname(body_path), exist_ok=True)
+        # Atomický zápis – souběžné vlákno/běh nikdy nevidí napůl zapsaný soubor
+        for path, data, mode in ((body_path, response.content, "wb"),
+                                 (meta_path, json.dumps(meta), "w")):
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, mode) as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+
+    def _count(self, kind: str, nbytes: int = 0, saved: int = 0):
+        with self._lock:
+            self.stats[kind] += 1
+            self.stats["bytes"] += nbytes
+            self.stats["saved_bytes"] += saved
+
+    def get(self, session, url: str, timeout: float = 20) -> tuple:
+        # → (status_code, tělo v bajtech); 304 se navenek tváří jako 200 z cache
+        meta, body = self._load(url) if self.enabled else (None, None)
+        headers = {"Accept-Encoding": ACCEPT_ENCODING}
+        if meta:
+            if meta.get("etag"):
+                headers["If-None-Match"] = meta["etag"]
+            if meta.get("last_modified"):
+                headers["If-Modified-Since"] = meta["last_modified"]
+        try:
+            response = session.get(url, headers=headers, timeout=timeout)
+        except Exception:
+            self._count("error")
+            raise
+
+        wire = int(response.headers.get("Content-Length") or 0)
+        if response.status_code == 304 and body is not None:
+            self._count("hit", wire, len(body))
+            return 200, body
+        if response.status_code == 200:
+            self._count("miss", wire or len(response.content))
+            if self.enabled:
+                self._store(url, response)
+            return 200, response.content
+        self._count("error", wire)
+        return response.status_code, response.content
+
+    def summary(self) -> str:
+        s = self.stats
+        total = s["hit"] + s["miss"]
+        rate = s["hit"] / total * 100 if total else 0.0
+        return (f"HTTP cache: {s['hit']} hit / {s['miss']} miss ({rate:.0f} %), chyby {s['error']}, "
+                f"staženo {s['bytes'] / 1024:.0f} kB, ušetřeno {s['saved_bytes'] / 1024:.0f} kB")
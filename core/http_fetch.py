@@ -0,0 +1,102 @@
+import os
+import re
+import html
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+# =========================
+# Načítání stránek zápasu bez prohlížeče
+# Data zápasu jsou v inline <script> přímo v HTML, takže často stačí obyčejný
+# GET přes sdílenou session s connection poolingem. Prohlížeč je jen záloha.
+# =========================
+
+HTTP_FETCH_ENABLED = os.environ.get("WS_HTTP_FETCH", "1") != "0"
+HTTP_TIMEOUT = float(os.environ.get("WS_HTTP_TIMEOUT", "20"))
+
+DEFAULT_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9,cs;q=0.8",
+}
+
+_SCRIPT_RE = re.compile(r"<script[^>]*>(.*?)</script>", re.IGNORECASE | re.DOTALL)
+_BREADCRUMB_RE = re.compile(r'id="breadcrumb-nav"[^>]*>(.*?)</div>', re.IGNORECASE | re.DOTALL)
+_SPAN_RE = re.compile(r"<span[^>]*>(.*?)</span>", re.IGNORECASE | re.DOTALL)
+_LINK_RE = re.compile(r"<a[^>]*>(.*?)</a>", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def make_session(pool_size: int = 8, retries: int = 2, headers: dict = None) -> requests.Session:
+    session = requests.Session()
+    session.headers.update(headers or DEFAULT_HEADERS)
+    retry = Retry(total=retries, backoff_factor=0.5,
+                  status_forcelist=(429, 500, 502, 503, 504),
+                  allowed_methods=("GET", "HEAD"))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    # Jedna session na proces → znovupoužité TCP/TLS spojení mezi načteními
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = make_session()
+        return _session
+
+
+def fetch_match_html(match_url: str, session: requests.Session = None, timeout: float = HTTP_TIMEOUT):
+    session = session or get_session()
+    try:
+        response = session.get(match_url, timeout=timeout)
+    except requests.RequestException as e:
+        print(f"⚠️ HTTP načtení selhalo: {e}")
+        return None
+    if response.status_code != 200:
+        print(f"⚠️ HTTP načtení vrátilo status {response.status_code}")
+        return None
+    if "charset" not in response.headers.get("Content-Type", "").lower():
+        # Bez charsetu by requests dekódoval text/html jako ISO-8859-1 (rozbitá diakritika)
+        response.encoding = "utf-8"
+    return response.text
+
+
+def find_match_script(page_html: str):
+    # Stejná heuristika jako v prohlížeči: script s matchId, ne jen krátká zmínka
+    if not page_html or "matchId" not in page_html:
+        return None
+    for m in _SCRIPT_RE.finditer(page_html):
+        content = m.group(1)
+        if len(content) > 1000 and "matchId" in content:
+            return content
+    return None
+
+
+def _text(fragment: str) -> str:
+    return html.unescape(_TAG_RE.sub("", fragment)).strip()
+
+
+def parse_breadcrumb(page_html: str):
+    # (region, league, season) z #breadcrumb-nav, stejně jako XPath v prohlížeči
+    m = _BREADCRUMB_RE.search(page_html or "")
+    if not m:
+        return "", "", ""
+    nav = m.group(1)
+    span = _SPAN_RE.search(nav)
+    link = _LINK_RE.search(nav)
+    region = _text(span.group(1)) if span else ""
+    league_season = _text(link.group(1)) if link else ""
+    if " - " in league_season:
+        league, season = league_season.split(" - ", 1)
+    else:
+        league, season = league_season, ""
+    return region, league, season
@@ -0,0 +1,189 @@
+import numpy as np
+import pandas as pd
+
+from core.cache import match_id_from_url, is_finished
+from core.extract import extract_match_centre
+from core.http_fetch import HTTP_FETCH_ENABLED, fetch_match_html, find_match_script, parse_breadcrumb
+from core.metrics import annotate, span, trace
+from core.qualifiers import build_qualifier_table
+from core.schema import MatchFrames, apply_event_schema, build_match_table, match_info
+
+
+# =========================
+# Společné načtení a parsování zápasu pro obě stránky (a prefetch.py)
+# Cache → HTTP → prohlížeč; stránky (core/loader_30s.py, core/loader_lm.py) dodávají jen
+# vlastní načtení v prohlížeči: fetch(match_url, driver) → (data, region, league, season).
+# Bez převodu souřadnic: WS 0..100 pro x i y.
+# action_col = sloupec s názvem akce (displayName z 'type'): 30s "actionType", LM "type".
+# =========================
+
+def build_match_frames(data: dict, region: str, league: str, season: str, action_col: str) -> MatchFrames:
+    # Qualifiers zvlášť v dlouhém formátu (pořadí událostí = event_index)
+    with span("qualifiers"):
+        quals = build_qualifier_table([e.get("qualifiers") for e in data.get("events", [])])
+    with span("normalize", events=len(data.get("events", []))):
+        events_df = build_events_df(data, action_col)
+        match_df = build_match_table(data, region, league, season)
+    return MatchFrames(events_df, match_df, quals)
+
+
+# Metadata zápasu jsou v tabulce zápasu (build_match_table), v událostech jen matchId
+def build_events_df(data: dict, action_col: str) -> pd.DataFrame:
+    events = data.get("events", [])
+    if not events:
+        print("⚠️ Žádné události nenalezeny")
+        return pd.DataFrame()
+    for e in events:
+        e["matchId"] = data.get("matchId")
+
+    df = pd.DataFrame(events)
+    # Qualifiers jsou v samostatné tabulce (build_qualifier_table) – široké sloupce
+    # jen na vyžádání přes project_qualifiers
+    df = df.drop(columns=["qualifiers"], errors="ignore")
+
+    # Zploštění
+    if "period" in df:
+        df["period"] = pd.json_normalize(df["period"])["displayName"]
+    if "type" in df:
+        df[action_col] = pd.json_normalize(df["type"])["displayName"]
+        if action_col != "type":
+            # Syrový dict {"value", "displayName"} už nepotřebujeme – jen by zdvojnásobil velikost
+            df = df.drop(columns=["type"])
+    else:
+        df[action_col] = np.nan
+    if "satisfiedEventsTypes" in df:
+        # Seznam čísel → krátký text "12,56,11" (místo Python listu na řádek; Parquet bez JSON)
+        df["satisfiedEventsTypes"] = [",".join(map(str, v)) if isinstance(v, list) else None
+                                      for v in df["satisfiedEventsTypes"]]
+    if "outcomeType" in df:
+        df["outcomeType"] = pd.json_normalize(df["outcomeType"])["displayName"]
+    else:
+        df["outcomeType"] = np.nan
+
+    df["result"] = np.where(df["outcomeType"].str.lower().eq("successful"), "SUCCESS",
+                            np.where(df["outcomeType"].isna(), None, "FAIL"))
+
+    # Bez karty = chybějící hodnota (kategorie místo smíšeného False/"Yellow")
+    try:
+        x = df["cardType"].fillna({i: {} for i in df.index})
+        df["cardType"] = pd.json_normalize(x)["displayName"]
+    except Exception:
+        df["cardType"] = None
+
+    # Jména / týmy (playerId jako číslo, -1 = bez hráče)
+    df["playerId"] = df.get("playerId", pd.Series(index=df.index)).fillna(-1).astype(int)
+    df["playerName"] = df["playerId"].astype(str).map(data.get("playerIdNameDictionary", {}))
+
+    home_tid = data.get("home", {}).get("teamId")
+    away_tid = data.get("away", {}).get("teamId")
+    df["h_a"] = df["teamId"].map({home_tid: "h", away_tid: "a"})
+    df["squadName"] = df["teamId"].map({
+        home_tid: data.get("home", {}).get("name"),
+        away_tid: data.get("away", {}).get("name"),
+    })
+
+    # =========================
+    # Pomocné flagy (bez převodu souřadnic, přímo v WS 0..100)
+    # final third = x > 66.7 (tj. poslední třetina hřiště)
+    # penalta (na útočné straně) přibližně x >= 84.3 a |y-50| <= 29.65
+    # =========================
+    if "x" in df:
+        df["final_third_start"] = (df["x"] <= 66.7).astype(int)
+    if "endX" in df:
+        df["final_third_end"] = (df["endX"] > 66.7).astype(int)
+    if {"x", "y"}.issubset(df.columns):
+        df["penaltyBox"] = ((df["x"] >= 84.3) & (np.abs(df["y"] - 50) <= 29.65)).astype(int)
+    if {"endX", "endY"}.issubset(df.columns):
+        df["penaltyBox_end"] = ((df["endX"] >= 84.3) & (np.abs(df["endY"] - 50) <= 29.65)).astype(int)
+
+    return apply_event_schema(df)
+
+
+# =========================
+# Zdroje dat: HTTP a prohlížeč
+# =========================
+
+def read_breadcrumb(driver):
+    # Region, liga a sezóna z drobečkové navigace (nepovinné – chybějící = "")
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+
+    try:
+        region = driver.find_element(By.XPATH, '//*[@id="breadcrumb-nav"]/span[1]').text
+    except NoSuchElementException:
+        region = ""
+    try:
+        league_season = driver.find_element(By.XPATH, '//*[@id="breadcrumb-nav"]/a').text
+    except NoSuchElementException:
+        league_season = ""
+    league, _, season = league_season.partition(" - ")
+    return region, league, season
+
+
+# Stejná data bez prohlížeče – None, pokud HTTP odpověď data neobsahuje
+def get_events_df_via_http(match_url: str, action_col: str):
+    print(f"🌐 Zkouším načíst URL bez prohlížeče: {match_url}")
+    with span("http_fetch"):
+        page_html = fetch_match_html(match_url)
+    with span("find_script", strategy="http") as s:
+        script = find_match_script(page_html)
+        s["found"] = script is not None
+    if script is None:
+        print("⚠️ HTTP odpověď neobsahuje data zápasu – použiji prohlížeč")
+        return None
+    annotate(strategy="http")
+    try:
+        with span("json_parse"):
+            data = extract_match_centre(script)
+    except ValueError:
+        return None
+    region, league, season = parse_breadcrumb(page_html)
+    return build_match_frames(data, region, league, season, action_col)
+
+
+# Bez prohlížeče (prefetch, smoke test) – opakování nepomůže, dávka zápas jen přeskočí
+class BrowserUnavailable(RuntimeError):
+    pass
+
+
+def browser_loader(driver_pool, fetch):
+    # driver_pool: funkce vracející DriverPool (volá se až při neúspěchu HTTP) nebo None;
+    # fetch(match_url, driver) → (data, region, league, season)
+    if driver_pool is None:
+        return None
+
+    def load(match_url: str):
+        with driver_pool().checkout() as driver:
+            return fetch(match_url, driver)
+
+    return load
+
+
+def load_match(match_url: str, cache, store, namespace: str, browser_loader, action_col: str) -> MatchFrames:
+    # cache: EventCache(namespace, verze parseru); store: EventStore nebo None;
+    # browser_loader: match_url → (data, region, league, season), nebo None (jen cache a HTTP)
+    match_id = match_id_from_url(match_url)
+    with trace("load_match", page=namespace, match_id=match_id):
+        with span("cache_read"):
+            cached = cache.get(match_id)
+        if cached is not None:
+            print(f"⚡ Zápas {match_id} načten z cache")
+            annotate(source="cache")
+            return cached
+
+        frames = get_events_df_via_http(match_url, action_col) if HTTP_FETCH_ENABLED else None
+        if frames is not None:
+            annotate(source="http")
+        else:
+            if browser_loader is None:
+                raise BrowserUnavailable("HTTP načtení bez dat a prohlížeč není k dispozici")
+            annotate(source="browser")
+            frames = build_match_frames(*browser_loader(match_url), action_col)
+        annotate(events=len(frames.events))
+        finished = is_finished(match_info(frames.match).get("ftScore"))
+        with span("cache_write"):
+            cache.put(match_id, frames, live=not finished)
+            if store is not None and finished:
+                # Do sezónního úložiště jen dohrané zápasy (živé by se přepisovaly)
+                store.write_match(frames)
+        return frames
@@ -0,0 +1,60 @@
+from core.blocking import start_load_report, collect_load_report
+from core.extract import extract_match_centre, match_centre_via_js
+from core.figure_cache import FIGURE_DPI
+from core.loader import browser_loader, load_match as shared_load_match, read_breadcrumb
+from core.metrics import annotate, span
+from core.readiness import Deadline, READINESS_TIMEOUT, wait_for_match_script
+from core.schema import MatchFrames
+
+
+# =========================
+# Načtení zápasu z WhoScored 1xbet mirroru pro 30s.py (a prefetch.py) – Firefox
+# Parsování a cesta cache → HTTP → prohlížeč jsou společné v core/loader.py
+# PARSER_VERSION zvyš při každé změně parsování (starý cache se pak ignoruje)
+# =========================
+
+NAMESPACE = "30s"
+PARSER_VERSION = 4
+
+# Vzhled grafů – součást klíče cache obrázků, prefetch kreslí se stejným
+ACTION_COL = "actionType"
+PLOT_STYLE = {"figsize": (6, 4), "dpi": FIGURE_DPI, "facecolor": "#161B2E", "textcolor": "w"}
+# Metadata zápasu v CSV exportu u každé události (rozložení jako před oddělením tabulky zápasu)
+CSV_MATCH_COLUMNS = ("startDate", "startTime", "score", "ftScore", "htScore", "etScore", "venueName",
+                     "maxMinute", "region", "league", "season")
+
+
+def fetch_match_data(match_url: str, driver):
+    # Načtení v prohlížeči → (data, region, liga, sezóna); parsování je společné (core/loader.py)
+    # Selenium až tady – při HTTP načtení nebo zásahu do cache se vůbec neimportuje
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import WebDriverException
+
+    start_load_report(driver)
+    with span("navigation"):
+        try:
+            driver.get(match_url)
+        except WebDriverException:
+            driver.get(match_url)
+    wait_for_match_script(driver, Deadline(READINESS_TIMEOUT), match_url)
+
+    # Objekt stránky jedním execute_script, text scriptu jen jako záloha
+    data = match_centre_via_js(driver)
+    if data is not None:
+        annotate(strategy="js_object")
+    else:
+        with span("find_script", strategy="xpath"):
+            script_el = driver.find_element(By.XPATH, '//*[@id="layout-wrapper"]/script[1]')
+            script = script_el.get_attribute('innerHTML')
+        annotate(strategy="xpath")
+        with span("json_parse"):
+            data = extract_match_centre(script)
+    collect_load_report(driver, match_url)
+    return (data, *read_breadcrumb(driver))
+
+
+def load_match(match_url: str, cache, store=None, driver_pool=None) -> MatchFrames:
+    # cache: EventCache(NAMESPACE, PARSER_VERSION); store: EventStore nebo None;
+    # driver_pool: funkce vracející DriverPool (volá se jen při neúspěchu HTTP)
+    return shared_load_match(match_url, cache, store, NAMESPACE,
+                             browser_loader(driver_pool, fetch_match_data), ACTION_COL)
@@ -0,0 +1,289 @@
+import os
+import re
+import time
+
+from core.blocking import start_load_report, collect_load_report
+from core.extract import JS_EXTRACT_ENABLED, MATCH_ARGS_JS, extract_match_centre, match_centre_from_json
+from core.figure_cache import FIGURE_DPI
+from core.http_fetch import find_match_script
+from core.loader import browser_loader, load_match as shared_load_match, read_breadcrumb
+from core.metrics import annotate, span
+from core.readiness import Deadline, READINESS_TIMEOUT, wait_for_match_script
+from core.schema import MatchFrames
+from core.strategies import StrategyStats, run_strategies
+
+
+# =========================
+# Stažení dat pro pages/LM.py v Chromiu (bez převodu souřadnic, WS 0–100)
+# Strategie hledání dat v registru (adaptivní pořadí, limity – core/strategies.py); podrobný výpis do logu.
+# Parsování a cesta cache → HTTP → prohlížeč jsou společné v core/loader.py
+# PARSER_VERSION zvyš při každé změně parsování (starý cache se pak ignoruje)
+# =========================
+
+NAMESPACE = "lm"
+PARSER_VERSION = 7
+
+# Vzhled grafů – součást klíče cache obrázků
+ACTION_COL = "type"
+PLOT_STYLE = {"figsize": (6, 4), "dpi": FIGURE_DPI, "facecolor": "#161B2E", "textcolor": "w"}
+# Metadata zápasu v CSV exportu u každé události (rozložení jako před oddělením tabulky zápasu)
+CSV_MATCH_COLUMNS = ("startDate", "startTime", "score", "ftScore", "htScore", "etScore", "venueName",
+                     "maxMinute")
+
+
+# =========================
+# Strategie hledání dat zápasu v prohlížeči (core/strategies.py)
+# Funkce (driver, budget: Deadline) → data zápasu nebo None. Pořadí v registru je
+# jen výchozí – za běhu jde první ta, která v poslední době funguje.
+# Limity [s] jde přepsat: WS_STRATEGY_BUDGETS="xpath=8,page_source=2"
+# =========================
+
+DEFAULT_STRATEGY_BUDGETS = {"js_object": 2.0, "xpath": 5.0, "all_scripts": 4.0, "selectors": 2.0,
+                            "execute_script": 2.0, "page_source": 3.0}
+# Minimální čas na hledání, i když čekání na připravenost vyčerpalo celý deadline
+MIN_FIND_SECONDS = 3.0
+# Výchozí script timeout Selenia – vrací se po strategiích, které ho zkracují na svůj limit
+DEFAULT_SCRIPT_TIMEOUT = 30.0
+
+_PAGE_SOURCE_PATTERNS = [
+    re.compile(r'matchId.*?events.*?\]\s*\}\s*(?:,|\})', re.DOTALL),
+    re.compile(r'\{[^{}]*matchId[^{}]*events.*?\].*?\}', re.DOTALL),
+    re.compile(r'matchId[^}]*events[^}]*\]', re.DOTALL),
+]
+
+_FIND_SCRIPT_JS = """
+var scripts = document.getElementsByTagName('script');
+for (var i = 0; i < scripts.length; i++) {
+    var content = scripts[i].innerHTML;
+    if (content && content.includes('matchId')) {
+        return content;
+    }
+}
+return null;
+"""
+
+
+def _parse_budgets(raw: str) -> dict:
+    budgets = dict(DEFAULT_STRATEGY_BUDGETS)
+    for item in raw.split(","):
+        name, _, seconds = item.partition("=")
+        if name.strip() in budgets and seconds.strip():
+            budgets[name.strip()] = float(seconds)
+    return budgets
+
+
+STRATEGY_BUDGETS = _parse_budgets(os.environ.get("WS_STRATEGY_BUDGETS", ""))
+
+
+def _parse_script(content):
+    # Text scriptu → data; nečitelný text = neúspěch strategie (zkusí se další)
+    if not content or 'matchId' not in content:
+        return None
+    try:
+        with span("json_parse"):
+            return extract_match_centre(content)
+    except ValueError as e:
+        print(f"❌ Chyba při parsování JSON: {e}")
+        print(f"🔍 Script preview: {content[:500]}...")
+        return None
+
+
+def _execute_within(driver, budget, script):
+    # execute_script nejdéle do limitu strategie (script timeout → TimeoutException = neúspěch)
+    if budget.expired():
+        return None
+    driver.set_script_timeout(max(budget.remaining(), 0.1))
+    try:
+        return driver.execute_script(script)
+    finally:
+        driver.set_script_timeout(DEFAULT_SCRIPT_TIMEOUT)
+
+
+def strategy_js_object(driver, budget):
+    # Objekt stránky jako JSON jedním execute_script (bez innerHTML a hledání v textu)
+    args_json = _execute_within(driver, budget, MATCH_ARGS_JS)
+    if not args_json:
+        return None
+    with span("json_parse", source="js_object"):
+        return match_centre_from_json(args_json)
+
+
+def strategy_xpath(driver, budget):
+    # Původní XPath s čekáním – nejdéle do vyčerpání vlastního limitu
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+    from selenium.common.exceptions import TimeoutException
+
+    try:
+        script_element = WebDriverWait(driver, max(budget.remaining(), 0.1)).until(
+            EC.presence_of_element_located((By.XPATH, '//*[@id="layout-wrapper"]/script[1]'))
+        )
+    except TimeoutException:
+        return None
+    return _parse_script(script_element.get_attribute('innerHTML'))
+
+
+def strategy_all_scripts(driver, budget):
+    from selenium.webdriver.common.by import By
+
+    for script in driver.find_elements(By.TAG_NAME, "script"):
+        if budget.expired():
+            return None
+        try:
+            content = script.get_attribute('innerHTML')
+        except Exception:
+            continue
+        if content and 'matchId' in content and len(content) > 1000:
+            return _parse_script(content)
+    return None
+
+
+def strategy_selectors(driver, budget):
+    from selenium.webdriver.common.by import By
+    from selenium.common.exceptions import NoSuchElementException
+
+    selectors_to_try = [
+        '//script[contains(text(), "matchId")][1]',
+        '//*[@id="layout-wrapper"]//script[contains(text(), "matchId")]',
+        '//div[@id="layout-wrapper"]/script[1]',
+        '//body//script[contains(text(), "matchId")][1]'
+    ]
+    for selector in selectors_to_try:
+        if budget.expired():
+            return None
+        try:
+            content = driver.find_element(By.XPATH, selector).get_attribute('innerHTML')
+        except NoSuchElementException:
+            continue
+        if content and 'matchId' in content:
+            return _parse_script(content)
+    return None
+
+
+def strategy_execute_script(driver, budget):
+    return _parse_script(_execute_within(driver, budget, _FIND_SCRIPT_JS))
+
+
+def strategy_page_source(driver, budget):
+    # Nejdřív stejné lineární hledání scriptu jako u HTTP načtení, regexy jen jako poslední možnost.
+    # page_source nejde přerušit – limit se kontroluje před a po stažení zdroje
+    if budget.expired():
+        return None
+    page_source = driver.page_source
+    if budget.expired():
+        return None
+    data = _parse_script(find_match_script(page_source))
+    if data is not None:
+        return data
+    for pattern in _PAGE_SOURCE_PATTERNS:
+        if budget.expired():
+            return None
+        match = pattern.search(page_source)
+        if match:
+            return _parse_script(match.group(0))
+    return None
+
+
+STRATEGIES = {
+    "js_object": strategy_js_object,
+    "xpath": strategy_xpath,
+    "all_scripts": strategy_all_scripts,
+    "selectors": strategy_selectors,
+    "execute_script": strategy_execute_script,
+    "page_source": strategy_page_source,
+}
+if not JS_EXTRACT_ENABLED:
+    del STRATEGIES["js_object"]
+
+_stats = None
+
+
+def strategy_stats() -> StrategyStats:
+    # Jedna instance na proces (soubor se čte až při prvním načtení přes prohlížeč)
+    global _stats
+    if _stats is None:
+        _stats = StrategyStats(NAMESPACE)
+    return _stats
+
+
+def fetch_match_data(match_url: str, driver):
+    # Načtení v prohlížeči → (data, region, liga, sezóna); parsování je společné (core/loader.py)
+    # Selenium až tady – při HTTP načtení nebo zásahu do cache se vůbec neimportuje
+    from selenium.common.exceptions import WebDriverException
+
+    try:
+        print(f"🌐 Načítám URL pomocí Chrome: {match_url}")
+        start_load_report(driver)
+        
+        # Pokus o načtení stránky s retry logikou
+        max_retries = 3
+        with span("navigation") as nav:
+            for attempt in range(max_retries):
+                nav["attempts"] = attempt + 1
+                try:
+                    driver.get(match_url)
+                    print(f"✅ URL načtena, pokus {attempt + 1}")
+                    break
+                except WebDriverException as e:
+                    print(f"⚠️ Pokus {attempt + 1}/{max_retries} neúspěšný: {e}")
+                    if attempt == max_retries - 1:
+                        raise
+                    time.sleep(3)
+        
+        # Čekáme jen do okamžiku, kdy je v DOM script s daty zápasu (jeden deadline)
+        deadline = Deadline(READINESS_TIMEOUT)
+        readiness = wait_for_match_script(driver, deadline, match_url)
+        if readiness.ready:
+            print(f"✅ Script s matchId připraven po {readiness.waited:.1f} s")
+        else:
+            print(f"⚠️ Script s matchId se neobjevil do {readiness.waited:.1f} s")
+
+        # Debugging: vypíšeme informace o stránce
+        print(f"🔍 Aktuální URL: {driver.current_url}")
+        print(f"🔍 Page title: {driver.title}")
+
+        # Strategie z registru v adaptivním pořadí, každá s vlastním limitem;
+        # zbytek deadlinu po čekání na připravenost je limit pro všechny dohromady
+        strategy, data = run_strategies(driver, STRATEGIES, STRATEGY_BUDGETS,
+                                        Deadline(max(deadline.remaining(), MIN_FIND_SECONDS)), strategy_stats())
+        annotate(strategy=strategy)
+        if data is None:
+            # Poslední pokus - vypíšeme část page source pro debugging
+            page_preview = driver.page_source[:2000] + "..." if len(driver.page_source) > 2000 else driver.page_source
+            print(f"🔍 Page source preview:\n{page_preview}")
+            raise Exception("❌ Script s matchId nebyl nalezen žádnou strategií")
+        print(f"✅ Data nalezena strategií {strategy}")
+
+        report = collect_load_report(driver, match_url)
+        if report["blocking"] == "devtools":
+            print(f"📦 Požadavky: {report['requests']}, přeneseno {report['bytes']} B, zablokováno "
+                  f"{report['blocked_requests']} požadavků (ušetřeno odhadem {report['blocked_bytes_estimate']} B)")
+        else:
+            print(f"📦 Požadavky: {report['requests']}, přeneseno {report['bytes']} B, "
+                  f"blokování: {report['blocking_note'] or report['blocking']}")
+
+        region, league, season = read_breadcrumb(driver)
+        home_team = data.get('home', {}).get('name', 'Unknown Home')
+        away_team = data.get('away', {}).get('name', 'Unknown Away')
+        date = data.get('startDate', '').split('T')[0] if data.get('startDate') else 'N/A'
+        print(f"📥 Zápas: {home_team} vs {away_team} ({data.get('score', 'N/A')})")
+        print(f"📆 Datum: {date} | Liga: {league} ({season}) | Region: {region}")
+        print(f"📊 Načteno {len(data.get('events', []))} událostí")
+        return data, region, league, season
+
+    except Exception as e:
+        print(f"❌ Celková chyba: {e}")
+        try:
+            print(f"🔍 Aktuální URL: {driver.current_url}")
+            print(f"🔍 Page title: {driver.title}")
+        except:
+            pass
+        raise
+
+
+def load_match(match_url: str, cache, store=None, driver_pool=None) -> MatchFrames:
+    # cache: EventCache(NAMESPACE, PARSER_VERSION); store: EventStore nebo None;
+    # driver_pool: funkce vracející DriverPool (volá se jen při neúspěchu HTTP)
+    return shared_load_match(match_url, cache, store, NAMESPACE,
+                             browser_loader(driver_pool, fetch_match_data), ACTION_COL)
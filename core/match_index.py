@@ -0,0 +1,173 @@
+import os
+import csv
+import sqlite3
+import datetime
+
+
+# =========================
+# Úložiště zápasů sledovaných týmů (SQLite, jeden soubor vedle all_matches.csv)
+#   matches       – zápas podle match_id (upsert: běh zapíše jen nové/změněné řádky)
+#   team_matches  – řádek = (tým, zápas) → zápas dvou sledovaných týmů je tu dvakrát.
+#                   Primární klíč (team_id, date, match_id) je zároveň clustered index,
+#                   "zápasy týmu X od–do" je range scan bez procházení celé tabulky.
+# Pročištění starých zápasů = DELETE přes index na date. all_matches.csv je jen export.
+#
+#   WS_MATCH_INDEX   cesta k souboru (výchozí match_index.sqlite)
+# =========================
+
+MATCH_INDEX_PATH = os.environ.get("WS_MATCH_INDEX", "match_index.sqlite")
+
+MATCH_COLUMNS = ["match_id", "date", "home_team", "home_team_id", "away_team", "away_team_id"]
+TEAM_MATCH_COLUMNS = ["team_id", "date", "match_id", "is_home", "opponent_id", "opponent"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS matches (
+    match_id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    home_team TEXT,
+    home_team_id INTEGER,
+    away_team TEXT,
+    away_team_id INTEGER
+);
+CREATE INDEX IF NOT EXISTS matches_date ON matches (date);
+CREATE TABLE IF NOT EXISTS team_matches (
+    team_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    match_id INTEGER NOT NULL,
+    is_home INTEGER NOT NULL,
+    opponent_id INTEGER,
+    opponent TEXT,
+    PRIMARY KEY (team_id, date, match_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS team_matches_match ON team_matches (match_id);
+CREATE INDEX IF NOT EXISTS team_matches_date ON team_matches (date);
+"""
+
+# Nezměněný zápas se nepřepisuje (denní běh pak zapisuje jen skutečně nové řádky)
+_UPSERT_MATCH = """
+INSERT INTO matches VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (match_id) DO UPDATE SET
+    date = excluded.date, home_team = excluded.home_team, home_team_id = excluded.home_team_id,
+    away_team = excluded.away_team, away_team_id = excluded.away_team_id
+WHERE (date, home_team, home_team_id, away_team, away_team_id)
+    IS NOT (excluded.date, excluded.home_team, excluded.home_team_id, excluded.away_team, excluded.away_team_id)
+"""
+
+
+def _iso(value) -> str:
+    return value.isoformat() if isinstance(value, (datetime.date, datetime.datetime)) else str(value)[:10]
+
+
+def _int_or_raw(value):
+    # Id z CSV/API; "N/A" (chybějící tým) zůstává textem jako dřív v CSV
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return value
+
+
+def team_rows(rows, team_ids: frozenset) -> list:
+    # Řádky zápasů (MATCH_COLUMNS) → řádky po sledovaných týmech
+    out = []
+    for match_id, date, home_team, home_team_id, away_team, away_team_id in rows:
+        for team_id in team_ids.intersection((home_team_id, away_team_id)):
+            if team_id == home_team_id:
+                out.append((team_id, date, match_id, 1, away_team_id, away_team))
+            else:
+                out.append((team_id, date, match_id, 0, home_team_id, home_team))
+    return out
+
+
+class MatchIndex:
+    def __init__(self, path: str = MATCH_INDEX_PATH):
+        self.path = path
+        folder = os.path.dirname(os.path.abspath(path))
+        os.makedirs(folder, exist_ok=True)
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM matches").fetchone()[0]
+
+    def upsert(self, rows, team_ids: frozenset) -> int:
+        # rows: MATCH_COLUMNS; vrací počet skutečně zapsaných zápasů
+        rows = [(_int_or_raw(m), _iso(d), h, _int_or_raw(h_id), a, _int_or_raw(a_id))
+                for m, d, h, h_id, a, a_id in rows]
+        per_team = team_rows(rows, team_ids)
+        with self.conn:
+            before = self.conn.total_changes
+            self.conn.executemany(_UPSERT_MATCH, rows)
+            written = self.conn.total_changes - before
+            # Přeložený zápas: původní datum pryč, jinak by zůstal pod starým klíčem
+            self.conn.executemany("DELETE FROM team_matches WHERE team_id = ? AND match_id = ? AND date <> ?",
+                                  [(t, m, d) for t, d, m, _, _, _ in per_team])
+            self.conn.executemany("INSERT OR REPLACE INTO team_matches VALUES (?, ?, ?, ?, ?, ?)", per_team)
+        return written
+
+    def prune(self, before) -> int:
+        before = _iso(before)
+        with self.conn:
+            self.conn.execute("DELETE FROM team_matches WHERE date < ?", (before,))
+            return self.conn.execute("DELETE FROM matches WHERE date < ?", (before,)).rowcount
+
+    def import_csv(self, csv_path: str, team_ids: frozenset) -> int:
+        # Jednorázový převod dřívějšího all_matches.csv do prázdného úložiště
+        if len(self) or not os.path.exists(csv_path):
+            return 0
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            rows = [[row[c] for c in MATCH_COLUMNS] for row in csv.DictReader(f)]
+        return self.upsert(rows, team_ids)
+
+    def export_csv(self, csv_path: str) -> int:
+        # Stejný formát jako dřívější all_matches.csv (nejnovější první)
+        cur = self.conn.execute(f"SELECT {', '.join(MATCH_COLUMNS)} FROM matches ORDER BY date DESC, match_id DESC")
+        tmp_path = csv_path + ".tmp"
+        count = 0
+        with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+            # "\n" jako dřívější all_matches.csv (csv.writer jinak píše "\r\n" → celý soubor v diffu)
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(MATCH_COLUMNS + ["Home_team - Away_team"])
+            for row in cur:
+                writer.writerow(list(row) + [f"{row[2]} - {row[4]}"])
+                count += 1
+        os.replace(tmp_path, csv_path)
+        return count
+
+    def matches(self, since=None, until=None) -> list:
+        # Zápasy (MATCH_COLUMNS jako dict) v rozmezí dat, nejnovější první
+        sql = f"SELECT {', '.join(MATCH_COLUMNS)} FROM matches WHERE 1 = 1"
+        params = []
+        if since is not None:
+            sql += " AND date >= ?"
+            params.append(_iso(since))
+        if until is not None:
+            sql += " AND date <= ?"
+            params.append(_iso(until))
+        cur = self.conn.execute(sql + " ORDER BY date DESC, match_id DESC", params)
+        return [dict(zip(MATCH_COLUMNS, row)) for row in cur]
+
+    def team_matches(self, team_id: int, since=None, until=None) -> list:
+        # Řádky jako dict, nejnovější první
+        sql = "SELECT * FROM team_matches WHERE team_id = ?"
+        params = [int(team_id)]
+        if since is not None:
+            sql += " AND date >= ?"
+            params.append(_iso(since))
+        if until is not None:
+            sql += " AND date <= ?"
+            params.append(_iso(until))
+        cur = self.conn.execute(sql + " ORDER BY date DESC, match_id DESC", params)
+        return [dict(zip(TEAM_MATCH_COLUMNS, row)) for row in cur]
+
+    def teams(self) -> dict:
+        # team_id → počet zápasů v indexu
+        return dict(self.conn.execute("SELECT team_id, COUNT(*) FROM team_matches GROUP BY team_id"))
@@ -0,0 +1,132 @@
+import os
+import json
+import time
+import threading
+import contextvars
+from collections import deque
+from contextlib import contextmanager
+
+
+# =========================
+# Časové úseky (spany) načtení zápasu a kreslení grafů
+# trace = jedna operace (načtení zápasu, vykreslení grafů, start prohlížeče),
+# span = její fáze: driver_start, navigation, readiness, find_script (strategie),
+# json_parse, normalize, qualifiers, figure … Bez aktivního trace je span no-op,
+# takže stejné funkce jdou volat i z benchmarků a skriptů.
+# Hotový trace = jeden řádek JSON v logu + posledních N v paměti (expander "Výkon").
+#
+#   WS_METRICS=0       vypne měření úplně
+#   WS_METRICS_LOG     cesta k JSON-lines logu (výchozí .cache/metrics/spans.jsonl, prázdné = bez logu)
+#   WS_METRICS_UI=0    skryje expander "Výkon" ve stránkách
+# =========================
+
+METRICS_ENABLED = os.environ.get("WS_METRICS", "1") != "0"
+METRICS_LOG = os.environ.get("WS_METRICS_LOG", os.path.join(".cache", "metrics", "spans.jsonl"))
+METRICS_UI = os.environ.get("WS_METRICS_UI", "1") != "0"
+
+# Posledních N dokončených trace (pro expander a ladění)
+RECENT_TRACES = deque(maxlen=200)
+
+_current = contextvars.ContextVar("ws_metrics_trace", default=None)
+_log_lock = threading.Lock()
+
+
+class Trace:
+    def __init__(self, name: str, **attrs):
+        self.name = name
+        self.attrs = attrs
+        self.spans = []
+        self.ts = time.time()
+        self.started = time.perf_counter()
+        self.seconds = None
+        self.discarded = False
+
+    def add(self, name: str, seconds: float, **attrs):
+        self.spans.append(dict(attrs, name=name, ms=round(seconds * 1000, 1),
+                               start_ms=round((time.perf_counter() - self.started - seconds) * 1000, 1)))
+
+    def discard(self):
+        # Nic zajímavého (např. všechny grafy z cache) – do logu nepůjde
+        self.discarded = True
+
+    def to_dict(self) -> dict:
+        return {"trace": self.name, "ts": round(self.ts, 3), "ms": round((self.seconds or 0) * 1000, 1),
+                **self.attrs, "spans": self.spans}
+
+
+def _emit(t: Trace):
+    record = t.to_dict()
+    RECENT_TRACES.append(record)
+    if not METRICS_LOG:
+        return
+    line = json.dumps(record, ensure_ascii=False, default=str)
+    try:
+        with _log_lock:
+            os.makedirs(os.path.dirname(os.path.abspath(METRICS_LOG)), exist_ok=True)
+            with open(METRICS_LOG, "a", encoding="utf-8") as f:
+                f.write(line + "\n")
+    except OSError as e:
+        print(f"⚠️ Zápis metrik selhal: {e}")
+
+
+@contextmanager
+def trace(name: str, **attrs):
+    # Vnořený trace (např. načtení zápasu uvnitř dávky) se zapíše jako span nadřazeného
+    parent = _current.get()
+    if parent is not None:
+        with span(name, **attrs):
+            yield parent
+        return
+    t = Trace(name, **attrs)
+    if not METRICS_ENABLED:
+        yield t
+        return
+    token = _current.set(t)
+    try:
+        yield t
+        t.attrs.setdefault("status", "ok")
+    except Exception as e:
+        t.attrs["status"] = "error"
+        t.attrs["error"] = f"{type(e).__name__}: {e}"[:300]
+        raise
+    finally:
+        _current.reset(token)
+        t.seconds = time.perf_counter() - t.started
+        if not t.discarded:
+            _emit(t)
+
+
+@contextmanager
+def span(name: str, **attrs):
+    # Yield: dict atributů, které lze doplnit během úseku (např. použitá strategie)
+    t = _current.get()
+    if t is None:
+        yield attrs
+        return
+    started = time.perf_counter()
+    try:
+        yield attrs
+    except Exception as e:
+        attrs["error"] = type(e).__name__
+        raise
+    finally:
+        t.add(name, time.perf_counter() - started, **attrs)
+
+
+def record(name: str, seconds: float, **attrs):
+    # Úsek změřený jinde (např. v render workeru v jiném procesu)
+    t = _current.get()
+    if t is not None:
+        t.add(name, seconds, **attrs)
+
+
+def annotate(**attrs):
+    t = _current.get()
+    if t is not None:
+        t.attrs.update(attrs)
+
+
+def recent(name: str = None, **match) -> list:
+    # Poslední trace (nejnovější první), volitelně jen s danými atributy
+    return [t for t in reversed(RECENT_TRACES)
+            if (name is None or t["trace"] == name) and all(t.get(k) == v for k, v in match.items())]
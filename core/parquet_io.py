@@ -0,0 +1,70 @@
+import os
+import json
+import math
+
+import pandas as pd
+
+# Klíč ve schema metadatech Parquetu se seznamem sloupců uložených jako JSON text
+JSON_COLUMNS_KEY = b"ws_json_columns"
+
+
+def _is_missing(v):
+    return v is None or (isinstance(v, float) and math.isnan(v))
+
+
+def _needs_json(s: pd.Series) -> bool:
+    # Object sloupce s dicty/listy nebo se smíšenými typy (např. cardType False/"Yellow")
+    # Arrow neumí uložit napřímo – serializujeme je do JSON textu.
+    if not pd.api.types.is_object_dtype(s):
+        return False
+    return any(not _is_missing(v) and not isinstance(v, str) for v in s)
+
+
+def write_parquet(df: pd.DataFrame, path: str) -> int:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    out = df.reset_index(drop=True).copy()
+    out.columns = [str(c) for c in out.columns]
+    json_cols = [c for c in out.columns if _needs_json(out[c])]
+    for c in json_cols:
+        out[c] = [None if _is_missing(v) else json.dumps(v, default=str) for v in out[c]]
+
+    table = pa.Table.from_pandas(out, preserve_index=False)
+    meta = dict(table.schema.metadata or {})
+    meta[JSON_COLUMNS_KEY] = json.dumps(json_cols).encode("utf-8")
+    table = table.replace_schema_metadata(meta)
+
+    tmp_path = path + ".tmp"
+    pq.write_table(table, tmp_path, compression="zstd")
+    os.replace(tmp_path, path)
+    return os.path.getsize(path)
+
+
+def json_columns(schema) -> list:
+    meta = schema.metadata or {}
+    return json.loads(meta.get(JSON_COLUMNS_KEY, b"[]").decode("utf-8"))
+
+
+def _loads_lenient(v):
+    try:
+        return json.loads(v)
+    except ValueError:
+        return v
+
+
+def decode_json_columns(table, columns=None, lenient: bool = False) -> pd.DataFrame:
+    # lenient: při čtení více souborů může být sloupec v jednom JSON a v jiném prostý text
+    json_cols = json_columns(table.schema) if columns is None else columns
+    loads = _loads_lenient if lenient else json.loads
+    df = table.to_pandas()
+    for c in json_cols:
+        if c in df:
+            df[c] = [loads(v) if isinstance(v, str) else None for v in df[c]]
+    return df
+
+
+def read_parquet(path: str, columns=None) -> pd.DataFrame:
+    import pyarrow.parquet as pq
+
+    return decode_json_columns(pq.read_table(path, columns=columns))
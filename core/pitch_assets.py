@@ -0,0 +1,141 @@
+import io
+import threading
+from functools import lru_cache
+
+import numpy as np
+
+
+# =========================
+# Předpřipravené podklady pro grafy na hřišti
+# - VerticalPitch pro danou konfiguraci se vytvoří jednou (lru_cache)
+# - šablona obrázku (Figure + osy + nakreslené hřiště + ořez) se připraví jednou
+#   pro (druh grafu, velikost, dpi); při dalším grafu se z os jen odeberou
+#   datové vrstvy a nakreslí se nové – hřiště, rozložení ani bbox_inches="tight"
+#   se znovu nepočítají
+# - barevné mapy z registru (LinearSegmentedColormap s N=5000 se nestaví znovu)
+# - heatmapa zón jako jedna kolekce obdélníků místo pcolormesh na každou zónu
+# =========================
+
+# Rychlejší komprese PNG (výsledek se stejně cachuje, viz core/figure_cache.py)
+PNG_COMPRESS_LEVEL = 1
+
+_TEMPLATES = {}
+_TEMPLATES_LOCK = threading.Lock()
+
+
+def pitch_key(**kwargs) -> tuple:
+    return tuple(sorted(kwargs.items()))
+
+
+@lru_cache(maxsize=32)
+def get_pitch(key: tuple):
+    from mplsoccer import VerticalPitch
+
+    return VerticalPitch(**dict(key))
+
+
+@lru_cache(maxsize=64)
+def get_cmap(facecolor: str, color: str = "#d00000", n: int = 1000):
+    from matplotlib.colors import LinearSegmentedColormap
+
+    cmap = LinearSegmentedColormap.from_list("", [facecolor, color], N=n)
+    cmap._init()  # tabulka barev se spočítá hned, ne při prvním použití
+    return cmap
+
+
+def draw_pitch(ax, key: tuple, facecolor: str):
+    # Náhrada za pitch.draw(ax) + ax.set_facecolor(facecolor);
+    # na osách ze šablony už hřiště je → jen vrátí pitch
+    pitch = get_pitch(key)
+    if getattr(ax, "_ws_pitch", None) != (key, facecolor):
+        pitch.draw(ax=ax)
+        ax.set_facecolor(facecolor)
+        ax._ws_pitch = (key, facecolor)
+        ax._ws_base = set(ax.get_children())
+        ax._ws_limits = (ax.get_xlim(), ax.get_ylim())
+    return pitch
+
+
+def zone_heatmap(ax, pitch, stats, cmap, zorder=1, statistic="count"):
+    # Obdoba pitch.heatmap_positional(to_mplsoccer(stats)) jednou PolyCollection
+    from matplotlib.collections import PolyCollection
+    from matplotlib.colors import Normalize
+
+    values = np.asarray(getattr(stats, statistic), dtype=float)
+    polys = []
+    for x0, x1, y0, y1 in stats.grid.zone_bounds():
+        # VerticalPitch: x hřiště je svislá osa, y vodorovná
+        polys.append([(y0, x0), (y1, x0), (y1, x1), (y0, x1)])
+    norm = Normalize(vmin=np.nanmin(values), vmax=np.nanmax(values))
+    collection = PolyCollection(polys, array=values, cmap=cmap, norm=norm,
+                                edgecolors="face", linewidths=0, antialiaseds=False, zorder=zorder)
+    ax.add_collection(collection, autolim=False)
+    return collection
+
+
+class PitchTemplate:
+    def __init__(self, figsize, dpi):
+        from matplotlib.figure import Figure
+        from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+        self.fig = Figure(figsize=figsize, dpi=dpi)
+        FigureCanvasAgg(self.fig)
+        self.ax = self.fig.add_subplot(111)
+        self.dpi = dpi
+        self.bbox = None
+        self.lock = threading.Lock()
+
+    def reset(self):
+        # Odebere vše, co přibylo po nakreslení hřiště (datové vrstvy předchozího grafu)
+        base = getattr(self.ax, "_ws_base", None)
+        if base is None:
+            return
+        # Kontejnery (BarContainer z ax.bar, ErrorbarContainer …) nejsou mezi get_children()
+        # a bez odebrání by se v ax.containers hromadily s každým grafem
+        for container in list(self.ax.containers):
+            container.remove()
+        for artist in self.ax.get_children():
+            if artist not in base:
+                artist.remove()
+        xlim, ylim = self.ax._ws_limits
+        self.ax.set_xlim(xlim)
+        self.ax.set_ylim(ylim)
+        self.ax.set_prop_cycle(None)  # výchozí barvy jako na nových osách
+
+    def leftovers(self) -> int:
+        # Počet datových vrstev a kontejnerů, které na osách zůstaly (po reset() má být 0)
+        base = getattr(self.ax, "_ws_base", set())
+        return len(self.ax.containers) + sum(artist not in base for artist in self.ax.get_children())
+
+    def to_png(self) -> bytes:
+        if self.bbox is None:
+            # Ořez jako bbox_inches="tight" – spočítá se jen poprvé
+            self.bbox = self.fig.get_tightbbox(self.fig.canvas.get_renderer()).padded(0.1)
+        buf = io.BytesIO()
+        self.fig.savefig(buf, format="png", dpi=self.dpi, bbox_inches=self.bbox,
+                         pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL})
+        return buf.getvalue()
+
+
+def template_leftovers() -> dict:
+    # Šablony, na kterých po vykreslení něco zůstalo (kontrola v bench/suite.py)
+    with _TEMPLATES_LOCK:
+        templates = dict(_TEMPLATES)
+    counts = {key: template.leftovers() for key, template in templates.items()}
+    return {key: n for key, n in counts.items() if n}
+
+
+def render_png(name: str, draw, figsize=(6, 4), dpi: int = 200) -> bytes:
+    # draw(ax) nakreslí graf (hřiště přes draw_pitch); name odlišuje šablony různých grafů
+    key = (name, tuple(figsize), dpi)
+    with _TEMPLATES_LOCK:
+        template = _TEMPLATES.get(key)
+        if template is None:
+            template = _TEMPLATES[key] = PitchTemplate(figsize, dpi)
+    with template.lock:
+        template.reset()
+        try:
+            draw(template.ax)
+            return template.to_png()
+        finally:
+            template.reset()
@@ -0,0 +1,114 @@
+import numpy as np
+from matplotlib.colors import Normalize
+
+from core.pitch_assets import pitch_key, draw_pitch, get_cmap, zone_heatmap
+from core.zones import CHANNELS_5, JUEGO_DE_POSICION, bin_events, to_mplsoccer
+
+
+# =========================
+# Grafy vstupů do F3 a do vápna (sdílené 30s.py a pages/LM.py)
+# Souřadnice WS 0..100, bez převodu.
+# action_col: sloupec s názvem akce ("actionType" v 30s.py, "type" v LM.py)
+# =========================
+
+def _pitch(textcolor: str, pitch_color: str, **extra) -> tuple:
+    return pitch_key(pitch_type="custom", pitch_length=100, pitch_width=100, pitch_color=pitch_color,
+                     line_color=textcolor, linewidth=2, line_zorder=2, line_alpha=0.2, goal_alpha=0.2,
+                     **extra)
+
+
+# =========================
+# Entries do poslední třetiny (x přejde přes 66.7)
+# =========================
+def plot_final_third_entries(ax, df_team, facecolor="#161B2E", textcolor="w", action_col="actionType"):
+    pitch = draw_pitch(ax, _pitch(textcolor, "w"), facecolor)
+
+    mask = (
+        df_team[action_col].isin(["Pass", "Dribble"])) & \
+        (df_team["result"] == "SUCCESS") & \
+        (df_team["x"] <= 66.7) & (df_team["endX"] > 66.7)
+    sub = df_team.loc[mask].copy()
+
+    if sub.empty:
+        ax.text(50, 50, "Žádné vstupy do finální třetiny", ha="center", va="center", color=textcolor)
+        return
+
+    pitch.lines(sub["x"], sub["y"],
+                sub["endX"], sub["endY"],
+                linestyle="--", ax=ax, lw=1.8, zorder=2)
+    pitch.scatter(sub["endX"], sub["endY"], zorder=3,
+                  s=40, edgecolors="#000000", marker="o", ax=ax)
+
+    # Zóny 1–5 podle y koncového bodu (0–20, 20–40, ..., 80–100), viz core/zones.py
+    sub = sub[sub["endX"] > 66.7]
+    zone_stats = bin_events(CHANNELS_5, sub["endX"], sub["endY"],
+                            values=sub["PXT_PASS"] if "PXT_PASS" in sub else None)
+    counts = zone_stats.count
+    if counts.sum() == 0:
+        return
+
+    percentage = counts / counts.sum() * 100.0
+
+    # Sloupky jako overlay (umístíme je přibližně do středové oblasti hřiště)
+    bar_widths = [12, 8, 12, 8, 12]
+    x_pos = [80, 74, 68, 62, 56]  # z prava do leva poblíž hranice 66.7
+
+    observed = zone_stats.mean[counts > 0]
+    vmin = np.nanmin(observed) if not np.all(np.isnan(observed)) else 0.0
+    vmax = np.nanmax(observed) if not np.all(np.isnan(observed)) else 1.0
+    cmap = get_cmap(facecolor, "#d00000", 5000)
+    norm = Normalize(vmin=vmin, vmax=vmax)
+    gpa = np.nan_to_num(zone_stats.mean, nan=0.0)
+
+    ax.bar(x_pos,
+           -percentage,
+           width=bar_widths,
+           bottom=66.7,
+           align="center",
+           color=cmap(norm(gpa)),
+           alpha=0.5,
+           zorder=3,
+           ec="gray",
+           linewidth=2)
+
+    for x, height, val in zip(x_pos, -percentage + 66.7, counts):
+        ax.text(x, height, str(int(val)), ha="center", va="bottom", fontsize=12, color=textcolor, alpha=1)
+
+    ax.axhline(y=66.7, c=textcolor, ls="-", lw=3, alpha=0.3, zorder=5)
+
+
+# =========================
+# Vstupy do vápna + heatmapa startů (na soupeřově polovině)
+# =========================
+def plot_box_entries_heatmap(ax, df_team, facecolor="#161B2E", textcolor="w", action_col="actionType"):
+    pitch = draw_pitch(ax, _pitch(textcolor, facecolor, pad_bottom=-30), facecolor)
+
+    mask = (
+        df_team[action_col].isin(["Pass", "Dribble"])) & \
+        (df_team["result"] == "SUCCESS") & \
+        (df_team["penaltyBox"] != 1) & (df_team["penaltyBox_end"] == 1)
+    sub = df_team.loc[mask].copy()
+
+    if sub.empty:
+        ax.text(50, 50, "Žádné vstupy do vápna", ha="center", va="center", color=textcolor)
+        return
+
+    pitch.lines(sub["x"], sub["y"],
+                sub["endX"], sub["endY"],
+                linestyle="-", ax=ax, lw=2.5, zorder=2)
+    pitch.scatter(sub["endX"], sub["endY"], zorder=3,
+                  s=70, edgecolors="#000000", marker="o", ax=ax)
+
+    # Heatmapa startů jen na soupeřově polovině (x >= 50)
+    filt = sub[sub["x"] >= 50]
+    if not filt.empty:
+        zone_stats = bin_events(JUEGO_DE_POSICION, filt["x"], filt["y"])
+        zone_heatmap(ax, pitch, zone_stats, get_cmap(facecolor, "#d00000", 1000), zorder=1)
+        pitch.label_heatmap(to_mplsoccer(zone_stats), color=textcolor, fontsize=14, ax=ax, ha="center", va="center",
+                            str_format="{:.0F}", exclude_zeros=True)
+
+
+PLOT_FUNCS = {
+    "final_third_entries": plot_final_third_entries,
+    "box_entries_heatmap": plot_box_entries_heatmap,
+}
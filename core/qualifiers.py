@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+
+
+# =========================
+# Qualifiers v dlouhém formátu: jeden řádek na (událost, qualifier)
+#   event_index – pozice události v tabulce událostí (0..n-1)
+#   qualifier   – název (category)
+#   value       – hodnota z WS, None = qualifier bez hodnoty (příznak)
+# Místo stovek převážně prázdných sloupců; do širokého tvaru se
+# promítají jen qualifiers, které daný pohled potřebuje.
+# =========================
+
+QUALIFIER_COLUMNS = ("event_index", "qualifier", "value")
+
+
+def _empty_table() -> pd.DataFrame:
+    return pd.DataFrame({
+        "event_index": pd.Series(dtype=np.int32),
+        "qualifier": pd.Series(dtype="category"),
+        "value": pd.Series(dtype=object),
+    })
+
+
+def build_qualifier_table(qualifier_lists) -> pd.DataFrame:
+    # qualifier_lists: pro každou událost seznam {"type": {"displayName": ...}, "value": ...}
+    idx, names, values = [], [], []
+    for i, qual_list in enumerate(qualifier_lists):
+        if not isinstance(qual_list, list):
+            continue
+        for q in qual_list:
+            idx.append(i)
+            names.append(q["type"]["displayName"])
+            values.append(q.get("value"))
+    if not idx:
+        return _empty_table()
+    return pd.DataFrame({
+        "event_index": np.asarray(idx, dtype=np.int32),
+        "qualifier": pd.Categorical(names),
+        "value": pd.Series(values, dtype=object),
+    })
+
+
+def qualifier_names(quals: pd.DataFrame) -> list:
+    if quals is None or quals.empty:
+        return []
+    return sorted(quals["qualifier"].astype(str).unique())
+
+
+def project_qualifiers(events: pd.DataFrame, quals: pd.DataFrame, names=None) -> pd.DataFrame:
+    # Husté sloupce jen pro vybrané qualifiers (names=None → všechny, jako dřív json_normalize)
+    # Hodnota jako v původním parse_qualifiers: value, jinak True
+    if quals is None or quals.empty:
+        return events
+    names = qualifier_names(quals) if names is None else list(names)
+    sub = quals[quals["qualifier"].isin(names)]
+    out = events.copy()
+    positions = sub["event_index"].to_numpy()
+    values = sub["value"].where(sub["value"].notna(), True).to_numpy()
+    qualifier = sub["qualifier"].astype(str).to_numpy()
+    for name in names:
+        column = np.full(len(out), np.nan, dtype=object)
+        hit = qualifier == name
+        column[positions[hit]] = values[hit]
+        out[name] = column
+    return out
+
+
+def has_qualifier(events: pd.DataFrame, quals: pd.DataFrame, name: str) -> np.ndarray:
+    # Maska událostí s daným qualifierem (bez vytváření sloupců)
+    mask = np.zeros(len(events), dtype=bool)
+    if quals is not None and not quals.empty:
+        mask[quals.loc[quals["qualifier"] == name, "event_index"].to_numpy()] = True
+    return mask
+
+
+def concat_qualifiers(pairs) -> pd.DataFrame:
+    # pairs: [(events, quals), ...] ve stejném pořadí jako spojované události –
+    # event_index se posune o počet událostí předchozích zápasů
+    tables, offset = [], 0
+    for events, quals in pairs:
+        if events is None or events.empty:
+            continue
+        if quals is not None and not quals.empty:
+            shifted = quals.copy()
+            shifted["event_index"] = (shifted["event_index"] + offset).astype(np.int32)
+            tables.append(shifted)
+        offset += len(events)
+    if not tables:
+        return _empty_table()
+    out = pd.concat(tables, ignore_index=True)
+    out["qualifier"] = out["qualifier"].astype("category")
+    return out
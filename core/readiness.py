@@ -0,0 +1,65 @@
+import os
+import time
+from collections import deque, namedtuple
+
+from core.metrics import record
+
+
+# =========================
+# Připravenost stránky – místo pevných sleepů pollujeme, dokud se v DOM
+# neobjeví inline script s daty zápasu (matchId). Jeden celkový deadline.
+# =========================
+
+READINESS_TIMEOUT = float(os.environ.get("WS_READY_TIMEOUT", "30"))
+POLL_INTERVAL = 0.25
+
+# Stejná heuristika jako při hledání scriptu: obsahuje matchId a není to jen krátká zmínka
+_READY_JS = """
+var scripts = document.getElementsByTagName('script');
+for (var i = 0; i < scripts.length; i++) {
+    var t = scripts[i].text;
+    if (t && t.length > 1000 && t.indexOf('matchId') !== -1) {
+        return true;
+    }
+}
+return false;
+"""
+
+Readiness = namedtuple("Readiness", ["ready", "waited"])
+
+# Posledních N čekání (pro ladění a porovnání mezi zápasy)
+WAIT_LOG = deque(maxlen=200)
+
+
+class Deadline:
+    def __init__(self, seconds: float):
+        self.seconds = seconds
+        self.expires = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        return max(0.0, self.expires - time.monotonic())
+
+    def expired(self) -> bool:
+        return self.remaining() <= 0.0
+
+
+def wait_for_match_script(driver, deadline: Deadline, match_url: str = "", poll: float = POLL_INTERVAL) -> Readiness:
+    from selenium.common.exceptions import WebDriverException
+
+    started = time.monotonic()
+    ready = False
+    while True:
+        try:
+            ready = bool(driver.execute_script(_READY_JS))
+        except WebDriverException:
+            # Stránka se ještě přesměrovává / dokument neexistuje – zkusíme znovu
+            ready = False
+        if ready or deadline.expired():
+            break
+        time.sleep(min(poll, deadline.remaining()))
+
+    result = Readiness(ready=ready, waited=time.monotonic() - started)
+    record("readiness", result.waited, ready=result.ready)
+    WAIT_LOG.append({"match_url": match_url, "ready": result.ready,
+                     "waited": round(result.waited, 3), "ts": time.time()})
+    return result
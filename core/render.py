@@ -0,0 +1,137 @@
+import os
+import time
+import threading
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from core.figure_cache import data_hash, figure_key
+from core.metrics import annotate, record, span
+
+
+# =========================
+# Paralelní vykreslování grafů mimo vlákno Streamlit skriptu
+# Grafy se kreslí objektovým Agg API (core/pitch_assets.render_png, bez plt),
+# každý worker má vlastní šablony hřišť. Výsledkem jsou PNG bajty.
+#
+#   WS_RENDER_MODE      process (výchozí) | thread | serial
+#   WS_RENDER_WORKERS   počet workerů (výchozí min(4, počet CPU))
+# Agg kreslí pod GIL → skutečný souběh dává jen režim process.
+# =========================
+
+RENDER_MODE = os.environ.get("WS_RENDER_MODE", "process")
+RENDER_WORKERS = int(os.environ.get("WS_RENDER_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+# kind: klíč z core.plots.PLOT_FUNCS; df: jen sloupce, ze kterých graf kreslí
+RenderJob = namedtuple("RenderJob", ["kind", "df", "style", "action_col"])
+
+# Sloupce, ze kterých grafy v core/plots.py kreslí (hash pro cache obrázků) + sloupec akce.
+# Tady, ne v core/plots.py: zásah do cache obrázků pak neimportuje matplotlib/mplsoccer.
+PLOT_COLUMNS = ["result", "x", "y", "endX", "endY", "penaltyBox", "penaltyBox_end", "PXT_PASS"]
+
+
+def render_job(job: RenderJob) -> bytes:
+    from core.pitch_assets import render_png
+    from core.plots import PLOT_FUNCS
+
+    def draw(ax):
+        PLOT_FUNCS[job.kind](ax, job.df, facecolor=job.style["facecolor"], textcolor=job.style["textcolor"],
+                             action_col=job.action_col)
+
+    return render_png(job.kind, draw, figsize=job.style["figsize"], dpi=job.style["dpi"])
+
+
+def render_job_timed(job: RenderJob) -> tuple:
+    # (PNG, sekundy kreslení ve workeru) – čas pro metriky, i když se kreslí v jiném procesu
+    started = time.perf_counter()
+    png = render_job(job)
+    return png, time.perf_counter() - started
+
+
+def _warm_up():
+    # Import matplotlib/mplsoccer ve workeru předem (první graf pak nečeká);
+    # stejný import jako render_job → (pid, druhy grafů dostupné ve workeru)
+    from core.plots import PLOT_FUNCS
+    return os.getpid(), sorted(PLOT_FUNCS)
+
+
+class FigureRenderer:
+    def __init__(self, workers: int = RENDER_WORKERS, mode: str = RENDER_MODE):
+        self.workers = max(1, workers)
+        self.mode = mode if self.workers > 1 else "serial"
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and self.mode != "serial":
+                if self.mode == "process":
+                    import multiprocessing
+
+                    # spawn: fork procesu s vlákny Streamlitu/Selenia není bezpečný
+                    self._executor = ProcessPoolExecutor(max_workers=self.workers,
+                                                         mp_context=multiprocessing.get_context("spawn"))
+                else:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="render")
+            return self._executor
+
+    def prewarm(self):
+        executor = self._get_executor()
+        if executor is not None and self.mode == "process":
+            for _ in range(self.workers):
+                executor.submit(_warm_up)
+
+    def render_many_timed(self, jobs) -> list:
+        # [(PNG bajty, sekundy kreslení)] ve stejném pořadí jako jobs
+        jobs = list(jobs)
+        executor = self._get_executor()
+        if executor is None or len(jobs) < 2:
+            return [render_job_timed(job) for job in jobs]
+        try:
+            return list(executor.map(render_job_timed, jobs))
+        except BrokenProcessPool:
+            # Spadlý worker (např. nedostatek paměti) – dokreslíme v tomto procesu
+            print("⚠️ Render pool selhal – kreslím bez paralelizace")
+            with self._lock:
+                self._executor = None
+            return [render_job_timed(job) for job in jobs]
+
+    def render_many(self, jobs) -> list:
+        # PNG bajty ve stejném pořadí jako jobs
+        return [png for png, _ in self.render_many_timed(jobs)]
+
+    def render(self, job: RenderJob) -> bytes:
+        return self.render_many([job])[0]
+
+    def close(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+def render_team_figures(specs, cache, renderer: FigureRenderer, style: dict, action_col: str) -> list:
+    # specs: [(kind, df_team, match_id, team_id), ...] → PNG bajty ve stejném pořadí;
+    # grafy, které nejsou v cache (core/figure_cache.FigureCache), se kreslí paralelně
+    # Metriky: span "figure" za každý kreslený graf (čas ve workeru), "render" = celkový čas čekání
+    columns = PLOT_COLUMNS + [action_col]
+    with span("figure_lookup", figures=len(specs)) as lookup:
+        keys = [figure_key(match_id, team_id, kind, style, data_hash(df_team, columns))
+                for kind, df_team, match_id, team_id in specs]
+        pngs = [cache.get(key) for key in keys]
+        missing = [i for i, png in enumerate(pngs) if png is None]
+        lookup["cached"] = len(specs) - len(missing)
+    annotate(figures=len(specs), rendered=len(missing))
+    if not missing:
+        return pngs
+    jobs = []
+    for i in missing:
+        kind, df_team = specs[i][0], specs[i][1]
+        jobs.append(RenderJob(kind, df_team[[c for c in columns if c in df_team]], style, action_col))
+    with span("render", mode=renderer.mode, jobs=len(jobs)):
+        rendered = renderer.render_many_timed(jobs)
+    for i, (png, seconds) in zip(missing, rendered):
+        record("figure", seconds, kind=specs[i][0], team_id=specs[i][3])
+        cache.put(keys[i], png)
+        pngs[i] = png
+    return pngs
@@ -0,0 +1,115 @@
+from typing import NamedTuple
+
+import numpy as np
+import pandas as pd
+
+
+# =========================
+# Kompaktní typované schéma událostí
+# - opakující se texty → category, souřadnice → float32, flagy → int8
+# - metadata zápasu (skóre, stadion, datum, ...) v samostatné jednořádkové tabulce,
+#   v událostech zůstává jen matchId jako klíč
+# =========================
+
+class MatchFrames(NamedTuple):
+    events: pd.DataFrame
+    match: pd.DataFrame
+    qualifiers: pd.DataFrame = None  # dlouhý formát, viz core/qualifiers.py
+
+
+CATEGORY_COLUMNS = ("actionType", "type", "outcomeType", "period", "squadName", "playerName",
+                    "result", "h_a", "cardType")
+FLOAT32_COLUMNS = ("x", "y", "endX", "endY", "goalMouthY", "goalMouthZ", "blockedX", "blockedY")
+INT_COLUMNS = {"matchId": "int32", "teamId": "int32", "playerId": "int32", "eventId": "int32",
+               "minute": "int16", "second": "int8", "expandedMinute": "int16", "id": "int64"}
+FLAG_COLUMNS = ("final_third_start", "final_third_end", "penaltyBox", "penaltyBox_end")
+
+MATCH_COLUMNS = ("matchId", "startDate", "startTime", "score", "ftScore", "htScore", "etScore",
+                 "venueName", "maxMinute", "region", "league", "season",
+                 "homeTeamId", "homeName", "awayTeamId", "awayName")
+
+
+def _is_plain(s: pd.Series) -> bool:
+    # Kategorie jen pro skalární hodnoty (dicty/listy jako v 'type' u 30s.py nechat být)
+    if not pd.api.types.is_object_dtype(s):
+        return True
+    return all(isinstance(v, (str, int, float, bool, type(None))) for v in s)
+
+
+def apply_event_schema(df: pd.DataFrame) -> pd.DataFrame:
+    if df is None or df.empty:
+        return df
+    for c in CATEGORY_COLUMNS:
+        if c in df and not isinstance(df[c].dtype, pd.CategoricalDtype) and _is_plain(df[c]):
+            df[c] = df[c].astype("category")
+    for c in FLOAT32_COLUMNS:
+        if c in df:
+            df[c] = pd.to_numeric(df[c], errors="coerce").astype(np.float32)
+    for c, dtype in INT_COLUMNS.items():
+        if c in df:
+            s = pd.to_numeric(df[c], errors="coerce")
+            # Chybějící hodnoty → nullable integer (Int32, ...)
+            df[c] = s.astype(dtype.capitalize() if s.isna().any() else dtype)
+    for c in FLAG_COLUMNS:
+        if c in df:
+            df[c] = df[c].astype(np.int8)
+    return df
+
+
+def build_match_table(data: dict, region: str = "", league: str = "", season: str = "") -> pd.DataFrame:
+    home = data.get("home") or {}
+    away = data.get("away") or {}
+    row = {
+        "matchId": data.get("matchId"),
+        "startDate": data.get("startDate"),
+        "startTime": data.get("startTime"),
+        "score": data.get("score"),
+        "ftScore": data.get("ftScore"),
+        "htScore": data.get("htScore"),
+        "etScore": data.get("etScore"),
+        "venueName": data.get("venueName"),
+        "maxMinute": data.get("maxMinute"),
+        "region": region,
+        "league": league,
+        "season": season,
+        "homeTeamId": home.get("teamId"),
+        "homeName": home.get("name"),
+        "awayTeamId": away.get("teamId"),
+        "awayName": away.get("name"),
+    }
+    match_df = pd.DataFrame([row], columns=list(MATCH_COLUMNS))
+    for c in ("matchId", "homeTeamId", "awayTeamId"):
+        match_df[c] = pd.to_numeric(match_df[c], errors="coerce").astype("Int32")
+    return match_df
+
+
+def match_info(match_df: pd.DataFrame) -> dict:
+    if match_df is None or match_df.empty:
+        return {}
+    # Pythonní skaláry (ne numpy) – jdou rovnou do JSON manifestu, klíčů cache i metrik
+    return {k: (None if pd.isna(v) else v.item() if isinstance(v, np.generic) else v)
+            for k, v in match_df.iloc[0].items()}
+
+
+def with_match_columns(events: pd.DataFrame, match_df: pd.DataFrame, columns) -> pd.DataFrame:
+    # Sloupce zápasu u každé události (podle matchId, hned za ním) – rozložení CSV exportů
+    # z doby, kdy metadata byla přímo v událostech
+    if events is None or events.empty or match_df is None or match_df.empty or "matchId" not in events:
+        return events
+    columns = [c for c in columns if c in match_df and c not in events]
+    meta = match_df.dropna(subset=["matchId"]).drop_duplicates("matchId", keep="last")
+    meta = meta.set_index(meta["matchId"].astype("int64"))[columns]
+    rows = meta.reindex(events["matchId"].astype("int64").to_numpy())
+    out = events.copy()
+    position = out.columns.get_loc("matchId") + 1
+    for offset, c in enumerate(columns):
+        out.insert(position + offset, c, rows[c].to_numpy())
+    return out
+
+
+def concat_events(frames) -> pd.DataFrame:
+    # Různé zápasy mají různé sady kategorií → po spojení schéma znovu
+    frames = [f for f in frames if f is not None and not f.empty]
+    if not frames:
+        return pd.DataFrame()
+    return apply_event_schema(pd.concat(frames, ignore_index=True, sort=False))
@@ -0,0 +1,75 @@
+import os
+import threading
+from collections import OrderedDict
+
+from core.schema import MatchFrames, match_info
+
+
+# =========================
+# Historie načtených zápasů v rámci jedné Streamlit session
+# Přežije rerun (stažení CSV, změna widgetu) – bez nového scrapování.
+# Limit počtu zápasů i paměti; při překročení jde pryč nejdéle nepoužitý.
+#
+#   WS_SESSION_HISTORY      max. počet zápasů v historii (výchozí 5)
+#   WS_SESSION_HISTORY_MB   max. paměť DataFrame v historii (výchozí 200)
+# =========================
+
+SESSION_HISTORY_MAX_MATCHES = int(os.environ.get("WS_SESSION_HISTORY", "5"))
+SESSION_HISTORY_MAX_BYTES = int(float(os.environ.get("WS_SESSION_HISTORY_MB", "200")) * 1024 * 1024)
+
+
+def frames_nbytes(frames: MatchFrames) -> int:
+    return sum(int(t.memory_usage(deep=True).sum()) for t in frames if t is not None)
+
+
+def match_label(frames: MatchFrames) -> str:
+    info = match_info(frames.match)
+    date = (info.get("startDate") or "")[:10]
+    label = f"{info.get('homeName') or 'Home'} vs {info.get('awayName') or 'Away'}"
+    if info.get("score"):
+        label += f" {info['score']}"
+    return f"{label} ({date})" if date else label
+
+
+class MatchHistory:
+    def __init__(self, max_matches: int = SESSION_HISTORY_MAX_MATCHES, max_bytes: int = SESSION_HISTORY_MAX_BYTES):
+        self.max_matches = max(1, max_matches)
+        self.max_bytes = max_bytes
+        self._items = OrderedDict()  # key → (label, frames, nbytes, pořadí načtení); pořadí = LRU
+        self._loads = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._items)
+
+    def keys(self) -> list:
+        # Naposledy načtený první – pořadí se nemění výběrem (stabilní selectbox)
+        return sorted(self._items, key=lambda k: self._items[k][3], reverse=True)
+
+    def label(self, key) -> str:
+        entry = self._items.get(key)
+        return entry[0] if entry else str(key)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(entry[2] for entry in self._items.values())
+
+    def put(self, key, frames: MatchFrames):
+        with self._lock:
+            self._items.pop(key, None)
+            self._loads += 1
+            self._items[key] = (match_label(frames), frames, frames_nbytes(frames), self._loads)
+            self._evict()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is None:
+                return None
+            self._items.move_to_end(key)
+            return entry[1]
+
+    def _evict(self):
+        # Nejnovější zápas zůstává vždy, i když sám přesahuje limit
+        while len(self._items) > 1 and (len(self._items) > self.max_matches or self.nbytes > self.max_bytes):
+            self._items.popitem(last=False)
@@ -0,0 +1,112 @@
+import os
+import json
+import time
+import threading
+
+from core.metrics import span
+from core.readiness import Deadline
+
+
+# =========================
+# Registr strategií hledání dat zápasu s časovými limity a adaptivním pořadím
+# Strategie = funkce (driver, budget: Deadline) → data zápasu (dict) nebo None.
+# Každá má vlastní limit (nikdy víc než zbytek celkového deadlinu), takže jedna
+# pomalá strategie nespotřebuje čas ostatních.
+# Statistiky (úspěšnost a latence jako klouzavý průměr) se ukládají do JSON
+# a strategie, která v poslední době funguje, jde příště první → běžný případ
+# je jeden rychlý pokus. Neznámá strategie začíná na neutrální úspěšnosti 0.5.
+# Strategie, která překročí svůj limit, se počítá jako neúspěch, i když data vrátila.
+#
+#   WS_STRATEGY_STATS   cesta k souboru se statistikami (výchozí .cache/strategy_stats.json)
+# =========================
+
+STRATEGY_STATS_PATH = os.environ.get("WS_STRATEGY_STATS", os.path.join(".cache", "strategy_stats.json"))
+
+# Váha posledního pokusu v klouzavém průměru (vyšší = rychlejší reakce na změnu webu)
+EWMA_ALPHA = 0.3
+_PRIOR_SUCCESS = 0.5
+
+
+class StrategyStats:
+    def __init__(self, namespace: str, path: str = STRATEGY_STATS_PATH):
+        self.namespace = namespace
+        self.path = path
+        self._lock = threading.Lock()
+        self._stats = self._load().get(namespace, {})
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self):
+        # Sloučení s obsahem souboru (jiné jmenné prostory zůstávají), atomický zápis
+        with self._lock:
+            data = self._load()
+            data[self.namespace] = self._stats
+            folder = os.path.dirname(os.path.abspath(self.path))
+            tmp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            try:
+                os.makedirs(folder, exist_ok=True)
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    json.dump(data, f, indent=1, sort_keys=True)
+                os.replace(tmp_path, self.path)
+            except OSError as e:
+                print(f"⚠️ Uložení statistik strategií selhalo: {e}")
+
+    def record(self, name: str, ok: bool, seconds: float):
+        with self._lock:
+            s = self._stats.setdefault(name, {"attempts": 0, "successes": 0, "success": _PRIOR_SUCCESS})
+            s["attempts"] += 1
+            s["successes"] += int(ok)
+            s["success"] = round((1 - EWMA_ALPHA) * s["success"] + EWMA_ALPHA * float(ok), 4)
+            if ok:
+                # Latence jen úspěšných pokusů – neúspěch do limitu by zkresloval „jak rychle to funguje“
+                latency = s.get("latency", seconds)
+                s["latency"] = round((1 - EWMA_ALPHA) * latency + EWMA_ALPHA * seconds, 4)
+                s["last_success"] = round(time.time())
+
+    def order(self, names: list) -> list:
+        # Nejúspěšnější první, při shodě rychlejší; jinak pořadí z registru
+        with self._lock:
+            stats = {name: self._stats.get(name, {}) for name in names}
+
+        def key(item):
+            position, name = item
+            s = stats[name]
+            return (-s.get("success", _PRIOR_SUCCESS), s.get("latency", float("inf")), position)
+
+        return [name for _, name in sorted(enumerate(names), key=key)]
+
+
+def run_strategies(driver, strategies: dict, budgets: dict, deadline: Deadline, stats: StrategyStats):
+    # strategies: název → funkce; vrací (název, data) první úspěšné strategie, jinak (None, None).
+    # Výjimka strategie = neúspěch (další strategie se zkusí), ne pád načtení.
+    try:
+        for name in stats.order(list(strategies)):
+            if deadline.expired():
+                print("⏱️ Celkový limit hledání dat vyčerpán")
+                break
+            budget = Deadline(min(budgets.get(name, deadline.remaining()), deadline.remaining()))
+            started = time.monotonic()
+            with span("find_script", strategy=name, budget=round(budget.seconds, 1)) as s:
+                try:
+                    data = strategies[name](driver, budget)
+                except Exception as e:
+                    print(f"❌ Strategie {name} selhala: {e}")
+                    data = None
+                elapsed = time.monotonic() - started
+                # Překročený limit = neúspěch ve statistikách (i když data našla) → příště půjde dál v pořadí
+                overrun = elapsed > budget.seconds
+                if overrun:
+                    print(f"⏱️ Strategie {name} překročila limit {budget.seconds:.1f} s ({elapsed:.1f} s)")
+                    s["overrun"] = True
+                s["ok"] = data is not None
+            stats.record(name, data is not None and not overrun, elapsed)
+            if data is not None:
+                return name, data
+        return None, None
+    finally:
+        stats.save()
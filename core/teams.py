@@ -0,0 +1,26 @@
+import os
+
+
+# =========================
+# Sledované týmy (scraper) a tým, který se v appce kreslí vlevo
+#
+#   WS_TEAM_IDS           teamId sledovaných týmů pro scraper, odděleno čárkou (výchozí 2216)
+#   WS_PREFERRED_TEAM_ID  teamId, který má v grafech levý sloupec (výchozí 349)
+# =========================
+
+def parse_team_ids(value) -> frozenset:
+    # "2216, 349" / [2216, "349"] → frozenset({2216, 349})
+    if isinstance(value, str):
+        value = value.replace(";", ",").split(",")
+    return frozenset(int(str(v).strip()) for v in value if str(v).strip())
+
+
+TRACKED_TEAM_IDS = parse_team_ids(os.environ.get("WS_TEAM_IDS", "2216"))
+PREFERRED_LEFT_TEAM_ID = int(os.environ.get("WS_PREFERRED_TEAM_ID", "349"))
+
+
+def pick_left_right(home_tid, away_tid, preferred_tid: int = PREFERRED_LEFT_TEAM_ID) -> tuple:
+    # Vlevo preferovaný tým, pokud hraje, jinak domácí
+    if preferred_tid in (home_tid, away_tid):
+        return preferred_tid, (away_tid if preferred_tid == home_tid else home_tid)
+    return home_tid, away_tid
@@ -0,0 +1,186 @@
+import atexit
+import threading
+
+import streamlit as st
+
+from core.cache import EventCache, match_id_from_url
+from core.driver_pool import DRIVER_PREWARM, DriverPool
+from core.drivers import DRIVER_FACTORIES
+from core.event_store import EventStore, STORE_ENABLED
+from core.figure_cache import FigureCache
+from core.metrics import METRICS_UI, recent, trace
+from core.render import FigureRenderer, render_team_figures
+from core.schema import match_info
+from core.session_history import MatchHistory
+from core.teams import pick_left_right
+
+
+# =========================
+# Sdílené části Streamlit stránek (30s.py, pages/LM.py)
+# Zdroje přes st.cache_resource – jeden na proces, společné pro obě stránky
+# (jedna cache obrázků a jeden render pool). Nic z toho při importu nespouští
+# Selenium ani matplotlib: prohlížeč se importuje až při startu, grafy až při kreslení.
+# =========================
+
+_DRIVER_POOLS = {}
+_DRIVER_POOLS_LOCK = threading.Lock()
+
+
+def get_driver_pool(browser: str) -> DriverPool:
+    # Sdílený pool prohlížečů pro všechny session (velikost: WS_DRIVER_POOL_SIZE).
+    # Volá ho až loader po miss v cache i přes HTTP – i z vláken dávky, proto ne st.cache_resource.
+    with _DRIVER_POOLS_LOCK:
+        pool = _DRIVER_POOLS.get(browser)
+        if pool is None:
+            pool = _DRIVER_POOLS[browser] = DriverPool(DRIVER_FACTORIES[browser])
+            # Při ukončení procesu zavřít prohlížeče (jinak zůstanou viset geckodriver/chromedriver)
+            atexit.register(pool.close)
+            if DRIVER_PREWARM:
+                pool.prewarm()
+    return pool
+
+
+@st.cache_resource
+def get_event_cache(namespace: str, parser_version: int) -> EventCache:
+    return EventCache(namespace=namespace, parser_version=parser_version)
+
+
+@st.cache_resource
+def get_event_store(namespace: str) -> EventStore:
+    return EventStore(namespace=namespace)
+
+
+def get_store_or_none(namespace: str):
+    return get_event_store(namespace) if STORE_ENABLED else None
+
+
+@st.cache_resource
+def get_figure_cache() -> FigureCache:
+    return FigureCache()
+
+
+# Sdílený render pool (procesy startují na pozadí při prvním vykreslení)
+@st.cache_resource
+def get_renderer() -> FigureRenderer:
+    renderer = FigureRenderer()
+    renderer.prewarm()
+    return renderer
+
+
+def team_figures_png(specs, style: dict, action_col: str) -> list:
+    # specs: [(kind, df_team, match_id, team_id), ...] → PNG bajty ve stejném pořadí
+    return render_team_figures(specs, get_figure_cache(), get_renderer(), style, action_col)
+
+
+# =========================
+# Historie načtených zápasů a zobrazení jednoho zápasu
+# =========================
+def match_history(state_key: str) -> MatchHistory:
+    # Načtené zápasy zůstávají v session (rerun po stažení CSV nebo změně widgetu je nesmaže)
+    return st.session_state.setdefault(state_key, MatchHistory())
+
+
+def load_into_history(history: MatchHistory, match_url: str, loader, active_key: str):
+    with st.spinner("Stahuji a zpracovávám data…"):
+        try:
+            loaded = loader(match_url)
+        except Exception as e:
+            st.error(f"Chyba při načítání: {e}")
+            st.stop()
+    history_key = match_id_from_url(match_url) or match_url
+    history.put(history_key, loaded)
+    st.session_state[active_key] = history_key  # nastavit před vytvořením selectboxu
+
+
+def history_selector(history: MatchHistory, active_key: str):
+    # Výběr z historie – zobrazení, přepnutí i stažení bez nového načítání
+    if not len(history):
+        return None
+    history_keys = history.keys()
+    if st.session_state.get(active_key) not in history_keys:
+        st.session_state[active_key] = history_keys[0]
+    col_hist, col_mem = st.columns([3, 1])
+    with col_hist:
+        selected = st.selectbox("Načtené zápasy", history_keys, key=active_key, format_func=history.label)
+    with col_mem:
+        st.caption(f"V historii {len(history)} / {history.max_matches} zápasů, {history.nbytes / 1e6:.1f} MB")
+    return history.get(selected)
+
+
+def show_match(frames, style: dict, action_col: str, events_csv, page: str = ""):
+    # events_csv: frames → bajty CSV ke stažení; page: NAMESPACE loaderu (pro metriky)
+    events_df = frames.events
+    if events_df.empty:
+        st.warning("Pro tento zápas se nepodařilo načíst žádné události.")
+        st.stop()
+
+    info = match_info(frames.match)
+    home = info.get("homeName") or "Home"
+    away = info.get("awayName") or "Away"
+    home_tid = info.get("homeTeamId")
+    away_tid = info.get("awayTeamId")
+    if home_tid is None or away_tid is None:
+        # fallback
+        team_ids = events_df["teamId"].unique()
+        home_tid = team_ids[0]
+        away_tid = team_ids[1] if len(team_ids) > 1 else home_tid
+
+    st.subheader(f"{home} vs {away}")
+    st.caption(f"Datum: {(info.get('startDate') or '')[:10]} | Skóre: {info.get('score') or ''} | Liga: {info.get('league') or ''} {info.get('season') or ''}")
+
+    # Výběr týmů do sloupců – vlevo preferovaný tým (WS_PREFERRED_TEAM_ID, core/teams.py), jinak home
+    left_tid, right_tid = pick_left_right(home_tid, away_tid)
+
+    team_map = {home_tid: home, away_tid: away}
+    left_name = team_map.get(left_tid, "Tým A")
+    right_name = team_map.get(right_tid, "Tým B")
+
+    st.write(f"Vlevo: **{left_name}** (teamId {left_tid}), vpravo: **{right_name}** (teamId {right_tid})")
+
+    left_df = events_df[events_df["teamId"] == left_tid].copy()
+    right_df = events_df[events_df["teamId"] == right_tid].copy()
+
+    c1, c2 = st.columns(2)
+    match_id = info.get("matchId")
+
+    # Všechny čtyři grafy najednou (paralelně), pak rozmístění do sloupců
+    with trace("figures", page=page, match_id=match_id) as t:
+        left_f3, left_box, right_f3, right_box = team_figures_png([
+            ("final_third_entries", left_df, match_id, left_tid),
+            ("box_entries_heatmap", left_df, match_id, left_tid),
+            ("final_third_entries", right_df, match_id, right_tid),
+            ("box_entries_heatmap", right_df, match_id, right_tid),
+        ], style, action_col)
+        if not t.attrs.get("rendered"):
+            t.discard()  # rerun se všemi grafy z cache – do logu nepatří
+
+    with c1:
+        st.markdown(f"### {left_name}")
+        st.image(left_f3, use_column_width=True)
+        st.image(left_box, use_column_width=True)
+
+    with c2:
+        st.markdown(f"### {right_name}")
+        st.image(right_f3, use_column_width=True)
+        st.image(right_box, use_column_width=True)
+
+    st.download_button("Stáhnout events.csv", data=events_csv(frames), file_name="events.csv", mime="text/csv")
+    if METRICS_UI:
+        performance_expander(page, match_id)
+
+
+def performance_expander(page: str, match_id):
+    # Poslední načtení a vykreslení tohoto zápasu v tomto procesu (core/metrics.py)
+    traces = (recent("load_match", page=page, match_id=match_id)[:1]
+              + recent("figures", page=page, match_id=match_id)[:1])
+    with st.expander("Výkon"):
+        if not traces:
+            st.caption("Pro tento zápas nejsou v tomto běhu aplikace žádná měření.")
+            return
+        for t in traces:
+            details = ", ".join(f"{k}: {t[k]}" for k in ("source", "strategy", "events", "rendered", "status") if k in t)
+            st.markdown(f"**{t['trace']}** – {t['ms'] / 1000:.2f} s ({details})")
+            rows = [{"fáze": sp["name"], "ms": sp["ms"], "od začátku [ms]": sp["start_ms"],
+                     "detail": ", ".join(f"{k}={v}" for k, v in sp.items() if k not in ("name", "ms", "start_ms"))}
+                    for sp in t["spans"]]
+            st.dataframe(rows, use_container_width=True, hide_index=True)
@@ -0,0 +1,123 @@
+from collections import namedtuple
+
+import numpy as np
+
+
+# =========================
+# Vektorové zónování událostí (WS souřadnice 0–100)
+# Grid = hrany v ose x a y + volitelná mapa buněk → zón (sloučené buňky,
+# např. vápno v Juego de Posición). Počty a průměry se počítají jedním
+# průchodem přes pole událostí (searchsorted + bincount), bez apply po řádcích.
+# =========================
+
+ZoneStats = namedtuple("ZoneStats", ["grid", "count", "sum", "mean"])
+
+
+class Grid:
+    def __init__(self, x_edges, y_edges, zone_map=None, closed: str = "left", name: str = ""):
+        # closed="left": [a, b) a poslední interval uzavřený (jako scipy/mplsoccer)
+        # closed="right": (a, b] a první interval uzavřený (jako původní zone_from_y)
+        self.x_edges = np.asarray(x_edges, dtype=float)
+        self.y_edges = np.asarray(y_edges, dtype=float)
+        self.closed = closed
+        self.name = name
+        ny, nx = len(self.y_edges) - 1, len(self.x_edges) - 1
+        if zone_map is None:
+            zone_map = np.arange(ny * nx).reshape(ny, nx)
+        self.zone_map = np.asarray(zone_map, dtype=np.intp)
+        if self.zone_map.shape != (ny, nx):
+            raise ValueError(f"zone_map musí mít tvar {(ny, nx)}")
+        self.n_zones = int(self.zone_map.max()) + 1
+
+    @property
+    def shape(self):
+        return self.zone_map.shape
+
+    def zone_bounds(self):
+        # (x0, x1, y0, y1) pro každou zónu – obálka jejích buněk
+        bounds = []
+        for zone in range(self.n_zones):
+            rows, cols = np.nonzero(self.zone_map == zone)
+            bounds.append((self.x_edges[cols.min()], self.x_edges[cols.max() + 1],
+                           self.y_edges[rows.min()], self.y_edges[rows.max() + 1]))
+        return bounds
+
+    def matrix(self, per_zone):
+        # Hodnoty po zónách → matice (ny, nx) po buňkách
+        return np.asarray(per_zone)[self.zone_map]
+
+
+def bin_index(values, edges, closed: str = "left"):
+    v = np.asarray(values, dtype=float)
+    if closed == "right":
+        idx = np.searchsorted(edges, v, side="left") - 1
+        idx[v == edges[0]] = 0
+    else:
+        idx = np.searchsorted(edges, v, side="right") - 1
+        idx[v == edges[-1]] = len(edges) - 2
+    valid = (v >= edges[0]) & (v <= edges[-1])  # NaN → False
+    return np.where(valid, idx, -1)
+
+
+def zone_index(grid: Grid, x, y):
+    xi = bin_index(x, grid.x_edges, grid.closed)
+    yi = bin_index(y, grid.y_edges, grid.closed)
+    ok = (xi >= 0) & (yi >= 0)
+    return np.where(ok, grid.zone_map[np.where(ok, yi, 0), np.where(ok, xi, 0)], -1)
+
+
+def bin_events(grid: Grid, x, y, values=None) -> ZoneStats:
+    zones = zone_index(grid, x, y)
+    inside = zones >= 0
+    count = np.bincount(zones[inside], minlength=grid.n_zones).astype(float)
+
+    if values is None:
+        sums = np.full(grid.n_zones, np.nan)
+        mean = np.full(grid.n_zones, np.nan)
+    else:
+        v = np.asarray(values, dtype=float)
+        use = inside & ~np.isnan(v)
+        sums = np.bincount(zones[use], weights=v[use], minlength=grid.n_zones)
+        n = np.bincount(zones[use], minlength=grid.n_zones)
+        with np.errstate(invalid="ignore", divide="ignore"):
+            mean = np.where(n > 0, sums / n, np.nan)
+    return ZoneStats(grid, count, sums, mean)
+
+
+def to_mplsoccer(stats: ZoneStats, statistic: str = "count"):
+    # Seznam slovníků ve tvaru mplsoccer bin_statistic → pitch.heatmap_positional / label_heatmap
+    values = getattr(stats, statistic)
+    out = []
+    for zone, (x0, x1, y0, y1) in enumerate(stats.grid.zone_bounds()):
+        out.append({
+            "statistic": np.array([[values[zone]]], dtype=float),
+            "x_grid": np.array([[x0, x1], [x0, x1]]),
+            "y_grid": np.array([[y0, y0], [y1, y1]]),
+            "cx": np.array([[(x0 + x1) / 2]]),
+            "cy": np.array([[(y0 + y1) / 2]]),
+        })
+    return out
+
+
+# ---------- předdefinované gridy ----------
+# 5 horizontálních pásem podle y (Zone 1..5), přes celou délku hřiště
+CHANNELS_5 = Grid([0, 100], [0, 20, 40, 60, 80, 100], closed="right", name="channels_5")
+
+# Juego de Posición – hrany stejné jako mplsoccer positional="full" na custom hřišti 100×100:
+# krajní pásma po šestinách délky, střed rozdělen na 3 koridory, vápna sloučená
+_JDP_X = [0, 16.5, 33.25, 50, 66.75, 83.5, 100]
+_JDP_Y = [0, 29.84, 40.84, 59.16, 70.16, 100]
+JUEGO_DE_POSICION = Grid(_JDP_X, _JDP_Y, zone_map=[
+    [0, 1, 2, 3, 4, 5],
+    [12, 14, 14, 17, 17, 13],
+    [12, 15, 15, 18, 18, 13],
+    [12, 16, 16, 19, 19, 13],
+    [6, 7, 8, 9, 10, 11],
+], name="juego_de_posicion")
+
+# 18 zón: 6 pásem po délce (čáry JdP) × 3 koridory (křídla + střed)
+ZONES_18 = Grid(_JDP_X, [0, _JDP_Y[1], _JDP_Y[4], 100], name="zones_18")
+
+
+def custom_grid(x_edges, y_edges, closed: str = "left") -> Grid:
+    return Grid(x_edges, y_edges, closed=closed, name="custom")
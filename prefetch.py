@@ -0,0 +1,146 @@
+import time
+import argparse
+import datetime
+
+from core.batch import BATCH_RETRIES, BATCH_WORKERS, load_matches
+from core.cache import EventCache, is_finished
+from core.event_store import EventStore, STORE_ENABLED
+from core.figure_cache import FigureCache
+from core.fixture_map import (PREFETCH_FIXTURES_URLS, PREFETCH_MAP_PATH, fixture_links, load_map, resolve_match,
+                              save_map)
+from core.http_fetch import fetch_match_html
+from core.loader import BrowserUnavailable
+from core.loader_30s import ACTION_COL, NAMESPACE, PARSER_VERSION, PLOT_STYLE, load_match
+from core.match_index import MATCH_INDEX_PATH, MatchIndex
+from core.metrics import trace
+from core.render import FigureRenderer, render_team_figures
+from core.schema import match_info
+
+
+# =========================
+# Prefetch dohraných zápasů z indexu scraperu (match_index.sqlite)
+# Sofascore zápas → WhoScored matchId (core/fixture_map.py) → načtení a parsování
+# stejně jako v 30s.py → event cache + sezónní úložiště + předkreslené grafy.
+# První otevření zápasu v appce je pak jen čtení z disku.
+#
+#   python prefetch.py                     # posledních 7 dní
+#   python prefetch.py --days 30 --workers 2
+# Jen HTTP načtení (bez prohlížeče); zápasy, které bez prohlížeče nejdou, se přeskočí (bez opakování).
+#
+# Nastavení (bez něj prefetch nemá co načíst – prefetch_map.csv je na začátku prázdný):
+#   WS_PREFETCH_FIXTURES_URL  WhoScored stránky s rozpisem sledovaných týmů (…/Teams/<id>/Fixtures/…),
+#                             odsud se dohledá WhoScored matchId; nebo páry ručně do prefetch_map.csv
+#   WS_CACHE_DIR, WS_STORE_DIR, WS_FIGURE_CACHE_DIR
+#                             kam se zapisuje; appka musí mít nastavené STEJNÉ hodnoty, jinak
+#                             čte výchozí .cache/… a předem načtená data nevidí. Denní workflow
+#                             zapisuje do prefetch/events, prefetch/store a prefetch/figures.
+# =========================
+
+PLOT_KINDS = ["final_third_entries", "box_entries_heatmap"]
+
+
+def select_fixtures(index_path: str, days: int, today: datetime.date) -> list:
+    # Zápasy od (dnes - days) do včera: dnešní ještě nemusí být dohrané
+    with MatchIndex(index_path) as index:
+        return index.matches(since=today - datetime.timedelta(days=days), until=today - datetime.timedelta(days=1))
+
+
+def resolve_fixtures(fixtures: list, mapping: dict, fixtures_urls: list) -> int:
+    # Doplní do mapping chybějící páry z WhoScored rozpisů; vrací počet nových
+    missing = [f for f in fixtures if f["match_id"] not in mapping]
+    if not missing or not fixtures_urls:
+        return 0
+    links = {}
+    for url in fixtures_urls:
+        links.update(fixture_links(fetch_match_html(url)))
+    added = 0
+    for fixture in missing:
+        ws_id = resolve_match(links, fixture["home_team"], fixture["away_team"])
+        if ws_id is None:
+            continue
+        mapping[fixture["match_id"]] = {
+            "sofascore_id": fixture["match_id"], "whoscored_id": ws_id,
+            "home_team": fixture["home_team"], "away_team": fixture["away_team"], "date": fixture["date"],
+        }
+        added += 1
+    return added
+
+
+def prerender(frames, figure_cache: FigureCache, renderer: FigureRenderer) -> int:
+    # Stejné klíče jako team_figures_png v 30s.py → appka grafy najde v cache
+    info = match_info(frames.match)
+    events_df = frames.events
+    specs = []
+    for team_id in (info.get("homeTeamId"), info.get("awayTeamId")):
+        df_team = events_df[events_df["teamId"] == team_id].copy()
+        specs += [(kind, df_team, info.get("matchId"), team_id) for kind in PLOT_KINDS]
+    with trace("figures", page=NAMESPACE, match_id=int(info.get("matchId")), prefetch=True):
+        render_team_figures(specs, figure_cache, renderer, PLOT_STYLE, ACTION_COL)
+    return len(specs)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Předem načte a vykreslí dohrané zápasy sledovaných týmů")
+    parser.add_argument("--days", type=int, default=7, help="jak daleko do minulosti hledat zápasy")
+    parser.add_argument("--index", default=MATCH_INDEX_PATH, help="SQLite úložiště scraperu")
+    parser.add_argument("--map", default=PREFETCH_MAP_PATH, help="mapa Sofascore → WhoScored")
+    parser.add_argument("--fixtures-url", action="append", default=None,
+                        help="WhoScored stránka s rozpisem týmu pro dohledání matchId (opakovat)")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS)
+    parser.add_argument("--retries", type=int, default=BATCH_RETRIES)
+    parser.add_argument("--no-figures", action="store_true", help="jen data, bez předkreslení grafů")
+    args = parser.parse_args(argv)
+
+    started = time.monotonic()
+    fixtures = select_fixtures(args.index, args.days, datetime.date.today())
+    mapping = load_map(args.map)
+    added = resolve_fixtures(fixtures, mapping, args.fixtures_url or PREFETCH_FIXTURES_URLS)
+    if added:
+        save_map(mapping, args.map)
+    unmapped = [f for f in fixtures if f["match_id"] not in mapping]
+    print(f"📋 {len(fixtures)} zápasů za posledních {args.days} dní, {added} nově namapováno, "
+          f"{len(unmapped)} bez WhoScored matchId")
+    for fixture in unmapped:
+        print(f"   ❔ {fixture['date']} {fixture['home_team']} - {fixture['away_team']} "
+              f"(sofascore {fixture['match_id']}) – doplň do {args.map}")
+
+    if not mapping and not (args.fixtures_url or PREFETCH_FIXTURES_URLS):
+        print(f"⚠️ {args.map} je prázdná a WS_PREFETCH_FIXTURES_URL / --fixtures-url není nastavené – "
+              f"není co načíst (viz hlavička prefetch.py)")
+
+    cache = EventCache(namespace=NAMESPACE, parser_version=PARSER_VERSION)
+    store = EventStore(namespace=NAMESPACE) if STORE_ENABLED else None
+    todo = [mapping[f["match_id"]]["whoscored_id"] for f in fixtures if f["match_id"] in mapping]
+    todo = [ws_id for ws_id in todo if not cache.has(ws_id)]
+    print(f"⏳ Načítám {len(todo)} zápasů (zbytek už je v cache)")
+
+    figure_cache = FigureCache()
+    renderer = FigureRenderer(mode="serial")
+    loaded, failed, skipped, figures = 0, 0, 0, 0
+    for result in load_matches(todo, lambda url: load_match(url, cache, store), args.workers, args.retries,
+                               no_retry=(BrowserUnavailable,)):
+        if isinstance(result.error, BrowserUnavailable):
+            skipped += 1
+            print(f"⏭️ {result.url}: bez prohlížeče nejde načíst – přeskočeno")
+            continue
+        if not result.ok:
+            failed += 1
+            print(f"❌ {result.url}: {result.error}")
+            continue
+        loaded += 1
+        frames = result.value
+        if not is_finished(match_info(frames.match).get("ftScore")):
+            print(f"⏸️ {result.url}: zápas ještě není dohraný")
+            continue
+        if not args.no_figures and not frames.events.empty:
+            figures += prerender(frames, figure_cache, renderer)
+        print(f"✅ {result.url} ({result.seconds:.1f} s)")
+
+    cache.flush()  # odložené časy přístupů (LRU) do indexu
+    print(f"🏁 Hotovo za {time.monotonic() - started:.1f} s: {loaded} načteno, {skipped} přeskočeno, "
+          f"{failed} chyb, {figures} grafů")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,62 +1,181 @@
-import requests
-import datetime
-import pandas as pd
 import os
+import json
+import time
+import argparse
+import datetime
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from core.http_cache import HTTP_CACHE_DIR, HttpCache
+from core.http_fetch import make_session
+from core.match_index import MATCH_INDEX_PATH, MatchIndex
+from core.teams import TRACKED_TEAM_IDS, parse_team_ids
+
+
+# =========================
+# Index zápasů sledovaných týmů ze Sofascore (scheduled-events po dnech)
+# Jeden průchod událostmi dne pro všechny týmy (množina teamId, WS_TEAM_IDS / --team-id).
+# Úložiště match_index.sqlite (core/match_index.py): upsert podle match_id, zapisují se jen nové
+# řádky; all_matches.csv je volitelný export (--export-csv, jen když se úložiště změnilo),
+# do prázdného úložiště se z něj importuje.
+# Bez argumentů: jen dnešní den (denní GitHub Action).
+# Backfill: python scraper.py --from 2024-07-01 --to 2025-05-31
+#   všechny dny souběžně přes jednu session s connection poolingem,
+#   s omezením počtu požadavků za sekundu a opakováním (429/5xx),
+#   výsledek se do úložiště zapíše jednou transakcí na konci.
+# Odpovědi se ukládají do .cache/http a revalidují přes ETag/Last-Modified (core/http_cache.py),
+# opakovaný běh nad stejnými dny stahuje jen hlavičky (304).
+# Lokální test: python -m bench.fixtures --serve-dir .cache/fixture-site,
+#   python tools/fixture_server.py .cache/fixture-site + --base-url http://127.0.0.1:8765
+# =========================
+
+SOFASCORE_BASE_URL = os.environ.get("SOFASCORE_BASE_URL", "https://www.sofascore.com").rstrip("/")
+
+# 📂 Cesta k CSV souboru (export / jednorázový import)
+CSV_FILE_PATH = "all_matches.csv"
+
+KEEP_DAYS = 365
+
+HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36",
+    "Accept": "application/json",
+}
+
+
+class RateLimiter:
+    # Nejvýš `rate` požadavků za sekundu napříč vlákny (rovnoměrně rozložené)
+    def __init__(self, rate: float):
+        self.interval = 1.0 / rate if rate and rate > 0 else 0.0
+        self._next = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self):
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next)
+            self._next = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def date_range(start: datetime.date, end: datetime.date) -> list:
+    if end < start:
+        start, end = end, start
+    return [start + datetime.timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def scheduled_events_url(base_url: str, day: datetime.date) -> str:
+    return f"{base_url}/api/v1/sport/football/scheduled-events/{day.strftime('%Y-%m-%d')}"
+
+
+def fetch_day(cache: HttpCache, session, base_url: str, day: datetime.date, limiter: RateLimiter,
+              timeout: float = 20) -> list:
+    # Opakování při 429/5xx a chybách spojení řeší Retry v session (core/http_fetch.make_session)
+    limiter.wait()
+    status, body = cache.get(session, scheduled_events_url(base_url, day), timeout=timeout)
+    if status == 404:
+        return []
+    if status != 200:
+        raise RuntimeError(f"HTTP {status}")
+    return json.loads(body).get("events", [])
+
+
+def matches_from_events(events: list, team_ids: frozenset) -> list:
+    # Jeden průchod, členství v množině sledovaných týmů
+    rows = []
+    for event in events:
+        home = event.get("homeTeam") or {}
+        away = event.get("awayTeam") or {}
+        home_team_id = home.get("id", "N/A")
+        away_team_id = away.get("id", "N/A")
+        if team_ids.isdisjoint((home_team_id, away_team_id)):
+            continue
+
+        match_id = event.get("id")
+        match_date = datetime.datetime.utcfromtimestamp(event.get("startTimestamp")).date()
+        rows.append([match_id, match_date, home.get("name", "N/A"), home_team_id,
+                     away.get("name", "N/A"), away_team_id])
+    return rows
+
+
+def fetch_days(days: list, team_ids: frozenset = TRACKED_TEAM_IDS, base_url: str = SOFASCORE_BASE_URL,
+               workers: int = 8, rate: float = 5.0, retries: int = 3, cache: HttpCache = None) -> tuple:
+    # Vrací (řádky zápasů, dny které se nepodařilo stáhnout)
+    session = make_session(pool_size=max(1, workers), retries=retries, headers=HEADERS)
+    cache = cache or HttpCache()
+    limiter = RateLimiter(rate)
+    rows, failed = [], []
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(days)))) as executor:
+        futures = {executor.submit(fetch_day, cache, session, base_url, day, limiter): day for day in days}
+        for future in as_completed(futures):
+            day = futures[future]
+            try:
+                rows += matches_from_events(future.result(), team_ids)
+            except Exception as e:
+                print(f"❌ {day}: chyba při stahování dat: {e}")
+                failed.append(day)
+    return rows, sorted(failed)
+
+
+def parse_date(value: str) -> datetime.date:
+    return datetime.datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def main(argv=None):
+    today = datetime.date.today()
+    parser = argparse.ArgumentParser(description="Index zápasů sledovaných týmů ze Sofascore")
+    parser.add_argument("--from", dest="date_from", type=parse_date, default=today, help="první den (YYYY-MM-DD)")
+    parser.add_argument("--to", dest="date_to", type=parse_date, default=None, help="poslední den (výchozí = --from)")
+    parser.add_argument("--workers", type=int, default=8, help="souběžných požadavků")
+    parser.add_argument("--rate", type=float, default=5.0, help="max. požadavků za sekundu (0 = bez limitu)")
+    parser.add_argument("--retries", type=int, default=3, help="opakování při 429/5xx a chybě spojení")
+    parser.add_argument("--base-url", default=SOFASCORE_BASE_URL, help="API Sofascore nebo lokální fixture server")
+    parser.add_argument("--http-cache", default=HTTP_CACHE_DIR, help="adresář cache odpovědí")
+    parser.add_argument("--no-http-cache", action="store_true", help="bez diskového cache (vždy celé stažení)")
+    parser.add_argument("--team-id", dest="team_ids", action="append", default=None,
+                        help="teamId (opakovat nebo čárkou oddělit; výchozí WS_TEAM_IDS)")
+    parser.add_argument("--index", default=MATCH_INDEX_PATH, help="SQLite úložiště zápasů (core/match_index.py)")
+    parser.add_argument("--csv", default=CSV_FILE_PATH, help="CSV pro jednorázový import a --export-csv")
+    parser.add_argument("--export-csv", action="store_true", help="po běhu přepsat --csv exportem z úložiště (jen při změně)")
+    parser.add_argument("--keep-days", type=int, default=KEEP_DAYS, help="jak staré zápasy v indexu ponechat")
+    args = parser.parse_args(argv)
+
+    team_ids = parse_team_ids(",".join(args.team_ids)) if args.team_ids else TRACKED_TEAM_IDS
+    days = date_range(args.date_from, args.date_to or args.date_from)
+    started = time.monotonic()
+    cache = HttpCache(args.http_cache, enabled=not args.no_http_cache)
+    rows, failed = fetch_days(days, team_ids, args.base_url.rstrip("/"), args.workers, args.rate, args.retries,
+                              cache)
+    print(f"📡 Staženo {len(days) - len(failed)}/{len(days)} dní za {time.monotonic() - started:.1f} s, "
+          f"nalezeno {len(rows)} zápasů týmů {', '.join(map(str, sorted(team_ids)))}")
+    print(f"🗄️ {cache.summary()}")
+
+    if len(failed) == len(days):
+        print("❌ Nepodařilo se stáhnout žádný den – úložiště beze změny")
+        return 1
+
+    keep_since = today - datetime.timedelta(days=args.keep_days)
+    with MatchIndex(args.index) as index:
+        imported = index.import_csv(args.csv, team_ids)
+        if imported:
+            print(f"📥 Převedeno {imported} zápasů z {args.csv} do {args.index}")
+        written = index.upsert(rows, team_ids)
+        pruned = index.prune(keep_since)
+        per_team = index.teams()
+        print(f"✅ {args.index}: {written} nových/změněných, {pruned} starších než {keep_since} smazáno, "
+              f"celkem {len(index)} ({', '.join(f'{t}: {n}' for t, n in sorted(per_team.items()))})")
+        # Export jen při změně (nebo chybějícím CSV) – jinak by denní běh commitoval nezměněný soubor
+        if args.export_csv and (imported or written or pruned or not os.path.exists(args.csv)):
+            print(f"📤 Export {index.export_csv(args.csv)} zápasů do {args.csv}")
+        elif args.export_csv:
+            print(f"📤 {args.csv} beze změny – export přeskočen")
+    if failed:
+        print(f"⚠️ Nestažené dny (spusť znovu s --from/--to): {', '.join(d.isoformat() for d in failed)}")
+        return 1
+    return 0
+
 
-# 📅 Získání dnešního data
-today = datetime.date.today().strftime("%Y-%m-%d")
-one_year_ago = datetime.date.today() - datetime.timedelta(days=365)
-
-# 📂 Cesta k CSV souboru
-csv_file_path = "all_matches.csv"  
-
-# 🏆 ID sledovaného týmu
-team_id_to_find = 2216
-
-# 📥 Načtení existujícího souboru, pokud existuje
-if os.path.exists(csv_file_path):
-    df_all_matches = pd.read_csv(csv_file_path)
-    df_all_matches["date"] = pd.to_datetime(df_all_matches["date"]).dt.date
-else:
-    df_all_matches = pd.DataFrame(columns=["match_id", "date", "home_team", "home_team_id", "away_team", "away_team_id"])
-
-# 🔗 API URL pro dnešní den
-url = f"https://www.sofascore.com/api/v1/sport/football/scheduled-events/{today}"
-
-# 📡 Stažení dat z API
-try:
-    headers = {
-        "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/119.0.0.0 Safari/537.36"
-    }
-    response = requests.get(url, headers=headers)
-    
-    if response.status_code == 200:
-        data = response.json()
-        events = data.get("events", [])
-
-        new_matches = []
-        for event in events:
-            match_id = event.get("id")
-            match_date = datetime.datetime.utcfromtimestamp(event.get("startTimestamp")).date()
-            home_team = event["homeTeam"]["name"] if "homeTeam" in event else "N/A"
-            home_team_id = event["homeTeam"]["id"] if "homeTeam" in event else "N/A"
-            away_team = event["awayTeam"]["name"] if "awayTeam" in event else "N/A"
-            away_team_id = event["awayTeam"]["id"] if "awayTeam" in event else "N/A"
-
-            if home_team_id == team_id_to_find or away_team_id == team_id_to_find:
-                new_matches.append([match_id, match_date, home_team, home_team_id, away_team, away_team_id])
-
-        df_new_matches = pd.DataFrame(new_matches, columns=["match_id", "date", "home_team", "home_team_id", "away_team", "away_team_id"])
-        df_all_matches = pd.concat([df_all_matches, df_new_matches]).drop_duplicates("match_id")
-        df_all_matches = df_all_matches.sort_values(by='date', ascending=False)
-        df_all_matches["Home_team - Away_team"] = df_all_matches["home_team"] + " - " + df_all_matches["away_team"]
-        df_all_matches = df_all_matches[df_all_matches["date"] >= one_year_ago]
-
-        df_all_matches.to_csv(csv_file_path, index=False, encoding="utf-8")
-        print(f"✅ Data byla aktualizována a uložena do {csv_file_path}")
-
-    else:
-        print(f"❌ Chyba při stahování dat: {response.status_code}")
-
-except Exception as e:
-    print(f"❌ Chyba při připojení k API: {e}")
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,114 @@
+import os
+import re
+import sys
+import argparse
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+
+# =========================
+# Lokální náhrada WhoScored / Sofascore – servíruje uložené HTML/JSON soubory
+# z adresáře, aby šly loadery zkoušet bez sítě.
+#   /matches/1874065/live/<slug>  → <root>/matches/1874065.html
+#   /<cesta>                      → <root>/<cesta>, <cesta>.json nebo <cesta>.html
+#   /api/v1/sport/football/scheduled-events/2025-03-01 → ….json (bench/synthetic.write_scheduled_events)
+#
+# bench/fixtures obsahuje jen komprimované fixtury benchmarků – do rozložení serveru je zapíše:
+#   python -m bench.fixtures --serve-dir .cache/fixture-site
+#   python tools/fixture_server.py .cache/fixture-site --port 8765
+#   python tools/fixture_server.py .cache/fixture-site --smoke   # load_match obou stránek proti serveru
+# =========================
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_MATCH_PATH_RE = re.compile(r"^/matches/(\d+)(?:/|$)", re.IGNORECASE)
+
+
+def _make_handler(root: str):
+    class FixtureHandler(SimpleHTTPRequestHandler):
+        def translate_path(self, path):
+            path = path.split("?", 1)[0].split("#", 1)[0]
+            m = _MATCH_PATH_RE.match(path)
+            if m:
+                return os.path.join(root, "matches", f"{m.group(1)}.html")
+            base = os.path.join(root, path.lstrip("/"))
+            for candidate in (base, base + ".json", base + ".html"):
+                if os.path.isfile(candidate):
+                    return candidate
+            return base
+
+        def log_message(self, format, *args):
+            pass
+
+    return FixtureHandler
+
+
+def serve(root: str, host: str = "127.0.0.1", port: int = 0):
+    # Spustí server ve vlákně na pozadí; vrací (server, base_url). Ukončení: server.shutdown()
+    server = ThreadingHTTPServer((host, port), _make_handler(os.path.abspath(root)))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def smoke(root: str) -> int:
+    # Každý <root>/matches/<id>.html načte loaderem 30s i LM přes HTTP (bez prohlížeče,
+    # cache v dočasném adresáři); 0 = vše načteno s událostmi
+    sys.path.insert(0, ROOT)
+    import tempfile
+    from core import loader_30s, loader_lm
+    from core.cache import EventCache
+
+    folder = os.path.join(root, "matches")
+    match_ids = sorted(f[:-len(".html")] for f in os.listdir(folder) if f.endswith(".html")) \
+        if os.path.isdir(folder) else []
+    if not match_ids:
+        print(f"❌ {folder} neobsahuje žádnou stránku zápasu (python -m bench.fixtures --serve-dir {root})")
+        return 1
+
+    server, base_url = serve(root)
+    failed = 0
+    try:
+        with tempfile.TemporaryDirectory() as cache_dir:
+            for match_id in match_ids:
+                url = f"{base_url}/matches/{match_id}/live/fixture"
+                for module in (loader_30s, loader_lm):
+                    cache = EventCache(module.NAMESPACE, module.PARSER_VERSION, root=cache_dir)
+                    try:
+                        frames = module.load_match(url, cache)
+                    except Exception as e:
+                        print(f"❌ {module.NAMESPACE} {match_id}: {e}")
+                        failed += 1
+                        continue
+                    if frames.events.empty:
+                        print(f"❌ {module.NAMESPACE} {match_id}: žádné události")
+                        failed += 1
+                    else:
+                        print(f"✅ {module.NAMESPACE} {match_id}: {len(frames.events)} událostí, "
+                              f"{len(frames.qualifiers)} qualifiers")
+    finally:
+        server.shutdown()
+    return 1 if failed else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Lokální server s uloženými fixtures")
+    parser.add_argument("root", help="adresář s fixtures")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--smoke", action="store_true", help="jen ověřit load_match proti serveru a skončit")
+    args = parser.parse_args(argv)
+
+    if args.smoke:
+        return smoke(os.path.abspath(args.root))
+
+    server = ThreadingHTTPServer((args.host, args.port), _make_handler(os.path.abspath(args.root)))
+    print(f"📡 Servíruji {args.root} na http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,140 @@
+import os
+import re
+import ast
+import sys
+import json
+import shutil
+import argparse
+import tempfile
+import subprocess
+
+
+# =========================
+# Čas importů stránek appky (python -X importtime) a doba prvního běhu / rerunu
+#   importy:  top-level importy stránky v čistém interpreteru → celkový čas,
+#             nejdražší moduly a jestli se načetlo Selenium / matplotlib / mplsoccer
+#   --apptest: streamlit.testing AppTest – studený první běh stránky a rerun
+#   --ref:     totéž pro starší verzi z gitu (např. --ref HEAD~1) pro porovnání
+#
+#   python tools/importtime.py 30s.py pages/LM.py --apptest --ref HEAD~1
+# =========================
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY_MODULES = ["selenium", "matplotlib", "mplsoccer", "scipy", "geckodriver_autoinstaller"]
+
+_LINE_RE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+_APPTEST_SCRIPT = """
+import os, sys, time, json
+sys.path.insert(0, os.getcwd())
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file(os.path.abspath(sys.argv[1]), default_timeout=300)
+t0 = time.perf_counter(); at.run(); first = time.perf_counter() - t0
+t0 = time.perf_counter(); at.run(); rerun = time.perf_counter() - t0
+heavy = [name for name in json.loads(sys.argv[2]) if name in sys.modules]
+print(json.dumps({"first_run": first, "rerun": rerun, "heavy": heavy,
+                  "exception": [str(e.value) for e in at.exception]}))
+"""
+
+
+def page_imports(page_path: str) -> str:
+    # Jen importy na úrovni modulu – přesně to, co stránka platí při každém startu.
+    # Chybějící volitelný balík (např. geckodriver_autoinstaller) měření nezastaví.
+    tree = ast.parse(open(page_path, encoding="utf-8").read())
+    nodes = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return "\n".join(f"try:\n    {ast.unparse(n)}\nexcept ImportError:\n    pass" for n in nodes)
+
+
+def measure_imports(code: str, cwd: str) -> dict:
+    env = dict(os.environ, PYTHONPATH=cwd, PYTHONDONTWRITEBYTECODE="1")
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+    modules = []
+    for line in proc.stderr.splitlines():
+        m = _LINE_RE.match(line)
+        if m:
+            modules.append({"module": m.group(4), "self_us": int(m.group(1)), "cumulative_us": int(m.group(2)),
+                            "depth": len(m.group(3)) // 2})
+    loaded = {m["module"].split(".")[0] for m in modules}
+    top = sorted((m for m in modules if m["depth"] == 0), key=lambda m: m["cumulative_us"], reverse=True)
+    return {
+        "ok": proc.returncode == 0,
+        "error": proc.stderr.strip().splitlines()[-1] if proc.returncode else "",
+        "total_ms": sum(m["self_us"] for m in modules) / 1000,
+        "modules": len(modules),
+        "heavy": [name for name in HEAVY_MODULES if name in loaded],
+        "top": [(m["module"], m["cumulative_us"] / 1000) for m in top[:8]],
+    }
+
+
+def measure_apptest(page: str, cwd: str) -> dict:
+    pythonpath = os.pathsep.join(p for p in (cwd, os.environ.get("PYTHONPATH")) if p)
+    # Výchozí nastavení prostředí (jen PYTHONPATH) – měří se to, co uvidí uživatel
+    env = dict(os.environ, PYTHONPATH=pythonpath)
+    proc = subprocess.run([sys.executable, "-c", _APPTEST_SCRIPT, page, json.dumps(HEAVY_MODULES)], cwd=cwd, env=env,
+                          capture_output=True, text=True)
+    try:
+        return json.loads(proc.stdout.strip().splitlines()[-1])
+    except (IndexError, ValueError):
+        return {"error": (proc.stderr.strip().splitlines() or ["?"])[-1]}
+
+
+def export_ref(ref: str) -> str:
+    # Strom z gitu do dočasného adresáře (bez .cache a pracovních souborů)
+    folder = tempfile.mkdtemp(prefix="importtime-")
+    archive = subprocess.run(["git", "archive", ref], cwd=ROOT, capture_output=True, check=True)
+    subprocess.run(["tar", "-x", "-C", folder], input=archive.stdout, check=True)
+    return folder
+
+
+def report(label: str, page: str, cwd: str, apptest: bool) -> dict:
+    if not os.path.exists(os.path.join(cwd, page)):
+        print(f"— {label}: {page} neexistuje")
+        return {}
+    result = measure_imports(page_imports(os.path.join(cwd, page)), cwd)
+    status = "" if result["ok"] else f"  ⚠️ {result['error']}"
+    print(f"📦 {label} {page}: importy {result['total_ms']:.0f} ms, {result['modules']} modulů, "
+          f"těžké: {', '.join(result['heavy']) or '–'}{status}")
+    for name, ms in result["top"]:
+        print(f"     {ms:8.1f} ms  {name}")
+    if apptest:
+        run = measure_apptest(page, cwd)
+        result["apptest"] = run
+        if "error" in run:
+            print(f"   ⚠️ AppTest: {run['error']}")
+        else:
+            print(f"   ⏱️ první běh {run['first_run'] * 1000:.0f} ms, rerun {run['rerun'] * 1000:.0f} ms, "
+                  f"těžké po běhu: {', '.join(run.get('heavy', [])) or '–'}")
+            if run["exception"]:
+                # Stránka spadla – časy pak nejsou srovnatelné
+                print(f"   ⚠️ výjimka ve stránce: {run['exception'][0]}")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Čas importů a startu stránek Streamlit appky")
+    parser.add_argument("pages", nargs="*", default=["30s.py", "pages/LM.py"])
+    parser.add_argument("--apptest", action="store_true", help="změřit i první běh a rerun přes AppTest")
+    parser.add_argument("--ref", default=None, help="porovnat s verzí z gitu (např. HEAD~1)")
+    parser.add_argument("--json", default=None, help="uložit výsledky do JSON souboru")
+    args = parser.parse_args(argv)
+
+    results = {}
+    ref_dir = export_ref(args.ref) if args.ref else None
+    try:
+        for page in args.pages:
+            if ref_dir:
+                results[f"{args.ref}:{page}"] = report(args.ref, page, ref_dir, args.apptest)
+            results[page] = report("nyní", page, ROOT, args.apptest)
+    finally:
+        if ref_dir:
+            shutil.rmtree(ref_dir, ignore_errors=True)
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
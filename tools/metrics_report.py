@@ -0,0 +1,91 @@
+import os
+import sys
+import json
+import argparse
+import datetime
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.metrics import METRICS_LOG  # noqa: E402
+
+
+# =========================
+# Přehled z logu metrik (core/metrics.py, JSON-lines): kam jde čas načtení zápasu
+#   po dnech: počet trace, medián a p95 celkového času, podíl zdrojů (cache/http/browser)
+#   po fázích: medián a p95 každého spanu (driver_start, navigation, readiness, …)
+#
+#   python tools/metrics_report.py                       # výchozí log, posledních 14 dní
+#   python tools/metrics_report.py --log spans.jsonl --days 60 --trace figures
+# =========================
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    return values[min(len(values) - 1, int(round(q * (len(values) - 1))))]
+
+
+def read_traces(path: str, name: str, since: float) -> list:
+    traces = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                t = json.loads(line)
+            except ValueError:
+                continue  # useknutý řádek (pád při zápisu)
+            if t.get("trace") == name and t.get("ts", 0) >= since:
+                traces.append(t)
+    return traces
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Souhrn metrik načítání zápasů z JSON-lines logu")
+    parser.add_argument("--log", default=METRICS_LOG)
+    parser.add_argument("--days", type=int, default=14)
+    parser.add_argument("--trace", default="load_match", help="load_match | figures | driver_start")
+    args = parser.parse_args(argv)
+
+    if not args.log or not os.path.exists(args.log):
+        print(f"❌ Log {args.log!r} neexistuje (WS_METRICS_LOG)")
+        return 1
+    since = (datetime.datetime.now() - datetime.timedelta(days=args.days)).timestamp()
+    traces = read_traces(args.log, args.trace, since)
+    if not traces:
+        print(f"ℹ️ Žádné trace '{args.trace}' za posledních {args.days} dní")
+        return 0
+
+    by_day = defaultdict(list)
+    for t in traces:
+        by_day[datetime.date.fromtimestamp(t["ts"]).isoformat()].append(t)
+    print(f"{'den':<11} {'počet':>6} {'medián':>9} {'p95':>9} {'chyby':>6}  zdroje")
+    for day in sorted(by_day):
+        day_traces = by_day[day]
+        totals = [t["ms"] for t in day_traces]
+        errors = sum(t.get("status") == "error" for t in day_traces)
+        sources = defaultdict(int)
+        for t in day_traces:
+            sources[t.get("source", "–")] += 1
+        print(f"{day:<11} {len(day_traces):>6} {percentile(totals, 0.5) / 1000:>8.2f}s "
+              f"{percentile(totals, 0.95) / 1000:>8.2f}s {errors:>6}  "
+              + ", ".join(f"{k} {v}" for k, v in sorted(sources.items())))
+
+    spans = defaultdict(list)
+    strategies = defaultdict(int)
+    for t in traces:
+        for sp in t["spans"]:
+            spans[sp["name"]].append(sp["ms"])
+        if t.get("source") in ("http", "browser"):
+            # Strategie, která data opravdu našla (neúspěšné pokusy jsou jen ve spanech)
+            strategies[t.get("strategy") or "nenalezeno"] += 1
+    print(f"\n{'fáze':<16} {'počet':>6} {'medián':>10} {'p95':>10} {'součet':>10}")
+    for name, values in sorted(spans.items(), key=lambda kv: -sum(kv[1])):
+        print(f"{name:<16} {len(values):>6} {percentile(values, 0.5):>8.0f}ms {percentile(values, 0.95):>8.0f}ms "
+              f"{sum(values) / 1000:>9.1f}s")
+    if strategies:
+        print("\nStrategie hledání scriptu: " + ", ".join(f"{k} {v}×" for k, v in sorted(strategies.items())))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())